@@ -4,15 +4,18 @@
 import ctypes; import atexit; import shutil; import tempfile; import subprocess;import webbrowser
 import winreg; import configparser; import sys; import os; import traceback; import functools
 import urllib.request; import json; import textwrap; import re; import qtawesome as qta
-import shlex; import socket; import markdown; import math; import threading; import datetime; import gc
+import shlex; import socket; import markdown; import math; import threading; import datetime; import gc; import mmap; import struct; import time
+import zlib; import hashlib; import sqlite3; import contextlib; import bisect; import fnmatch; import multiprocessing; import operator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from enum import Enum
-from collections import deque
+from collections import deque, OrderedDict, Counter
+from array import array
 from ctypes import wintypes
 from datetime import datetime, timedelta
 from PySide6.QtGui import (QAction, QFont, QIcon, QImage, QPixmap, QImageReader,
                            QTextDocument, QKeySequence, QShortcut)
 from PySide6.QtCore import (Qt, QSize, QThread, QObject, Signal, QTimer, QSettings,
-                            QUrl, QBuffer, QIODevice, QStandardPaths)
+                            QThreadPool, QRunnable, QAbstractListModel, QModelIndex, QUrl, QBuffer, QIODevice, QStandardPaths)
 from PySide6.QtWidgets import (QApplication, QCheckBox, QDialog, QFileDialog,
                                QFormLayout, QFrame, QGroupBox, QHBoxLayout,
                                QLabel, QMainWindow, QMenu, QMessageBox,
@@ -20,7 +23,7 @@ from PySide6.QtWidgets import (QApplication, QCheckBox, QDialog, QFileDialog,
                                QTextEdit, QVBoxLayout, QWidget, QSplitter, QSlider,
                                QLineEdit, QComboBox, QStackedWidget, QGridLayout,
                                QListWidget, QTextBrowser, QScrollArea, QSizePolicy,
-                               QListWidgetItem, QInputDialog)
+                               QListWidgetItem, QInputDialog, QListView)
 from bs4 import BeautifulSoup
 from bs4.element import Tag
 from pathlib import Path
@@ -73,15 +76,1822 @@ class RecentGroup(Enum):
     COMPILE_FOLDERS = 'compile_folders'
     DECOMPILE_FILES = 'decompile_files'
     DECOMPILE_FOLDERS = 'decompile_folders'
+
+# ---- Native XBT (Kodi texture bundle) support
+# ---- Layout mirrors Kodi's XBTFReader: "XBTF" magic, a one byte version, the texture
+# ---- directory (fixed size path + frame records), then the raw frame payloads.
+XBT_MAGIC = b"XBTF"
+XBT_VERSION = b"2"
+XBT_MAX_PATH = 256
+XBT_FMT_DXT1 = 0x01
+XBT_FMT_DXT3 = 0x02
+XBT_FMT_DXT5 = 0x04
+XBT_FMT_DXT5_YCOCG = 0x08
+XBT_FMT_A8R8G8B8 = 0x10  # Legacy BGRA code explicitly written by our TextureCompiler.
+XBT_FMT_A8 = 0x20
+XBT_FMT_RGBA8 = 0x40
+XBT_FMT_RGB8 = 0x80
+XBT_FMT_MASK = 0xFFFF
+XBT_FMT_OPAQUE = 0x10000
+XBT_FORMAT_NAMES = {
+    XBT_FMT_DXT1: "DXT1", XBT_FMT_DXT3: "DXT3", XBT_FMT_DXT5: "DXT5",
+    XBT_FMT_DXT5_YCOCG: "DXT5_YCoCg", XBT_FMT_A8R8G8B8: "ARGB",
+    XBT_FMT_A8: "A8", XBT_FMT_RGBA8: "RGBA8", XBT_FMT_RGB8: "RGB8",
+}
+_XBT_FILE_STRUCT = struct.Struct("<II")            # loop, frame count (after the path)
+_XBT_FRAME_STRUCT = struct.Struct("<IIIQQIQ")      # width, height, format, packed, unpacked, duration, offset
+
+class XbtFormatError(Exception):
+    """Raised when a file is not a readable XBT texture bundle."""
+
+class XbtFrame:
+    """A single frame directory entry. Payload bytes are sliced lazily from the mapped file."""
+    __slots__ = ('_reader', 'width', 'height', 'format', 'packed_size', 'unpacked_size', 'duration', 'offset')
+
+    def __init__(self, reader, width, height, fmt, packed_size, unpacked_size, duration, offset):
+        self._reader = reader
+        self.width = width
+        self.height = height
+        self.format = fmt
+        self.packed_size = packed_size
+        self.unpacked_size = unpacked_size
+        self.duration = duration
+        self.offset = offset
+
+    @property
+    def is_packed(self) -> bool:
+        """Kodi stores a frame LZO compressed whenever the packed and unpacked sizes differ."""
+        return self.packed_size != self.unpacked_size
+
+    @property
+    def format_name(self) -> str:
+        base = XBT_FORMAT_NAMES.get(self.format & XBT_FMT_MASK, "0x{:X}".format(self.format & XBT_FMT_MASK))
+        return base + (" (Opaque)" if self.format & XBT_FMT_OPAQUE else "")
+
+    @property
+    def payload(self) -> memoryview:
+        """Zero-copy view of the stored (possibly compressed) frame bytes."""
+        return self._reader.view[self.offset:self.offset + self.packed_size]
+
+class XbtTexture:
+    """A named texture inside the bundle. Animated textures carry more than one frame."""
+    __slots__ = ('path', 'loop', 'frames')
+
+    def __init__(self, path, loop, frames):
+        self.path = path
+        self.loop = loop
+        self.frames = frames
+
+    @property
+    def packed_size(self) -> int:
+        return sum(frame.packed_size for frame in self.frames)
+
+    @property
+    def unpacked_size(self) -> int:
+        return sum(frame.unpacked_size for frame in self.frames)
+
+class XbtReader:
+    """
+    Memory-maps a .xbt file and parses its header and texture directory in-process.
+    Nothing is extracted or decoded here; frames hand out memoryview slices on demand.
+    Use as a context manager, or call close() when done. With parse_directory=False only the mapping
+    is opened, for callers that already know their frames' offsets (see extract_xbt_chunk).
+    """
+    def __init__(self, path, parse_directory=True):
+        self.path = path
+        self.file_size = 0
+        self.header_size = 0
+        self.textures = []
+        self._file = None
+        self._map = None
+        self.view = None
+        try:
+            self._file = open(path, 'rb')
+            self.file_size = os.fstat(self._file.fileno()).st_size
+            if self.file_size < len(XBT_MAGIC) + 5:
+                raise XbtFormatError("File is too small to be an XBT texture bundle.")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.view = memoryview(self._map)
+            if parse_directory:
+                self._parse()
+        except XbtFormatError:
+            self.close()
+            raise
+        except (OSError, ValueError, struct.error) as e:
+            self.close()
+            raise XbtFormatError("Could not read XBT file: {}".format(e)) from e
+
+    def _parse(self):
+        data = self._map
+        if data[0:4] != XBT_MAGIC:
+            raise XbtFormatError("Missing 'XBTF' magic, not a Kodi texture file.")
+        version = data[4:5]
+        if version != XBT_VERSION:
+            raise XbtFormatError("Unsupported XBT version: {!r}".format(version))
+
+        (num_textures,) = struct.unpack_from("<I", data, 5)
+        pos = 9
+        min_entry = XBT_MAX_PATH + _XBT_FILE_STRUCT.size
+        if num_textures * min_entry > self.file_size - pos:
+            raise XbtFormatError("Texture count {} exceeds the file size.".format(num_textures))
+
+        file_size = self.file_size
+        frame_struct = _XBT_FRAME_STRUCT
+        textures = []
+        for _ in range(num_textures):
+            raw_path = data[pos:pos + XBT_MAX_PATH]
+            nul = raw_path.find(b'\0')
+            path = (raw_path if nul == -1 else raw_path[:nul]).decode('utf-8', 'replace')
+            loop, num_frames = _XBT_FILE_STRUCT.unpack_from(data, pos + XBT_MAX_PATH)
+            pos += min_entry
+            if pos + num_frames * frame_struct.size > file_size:
+                raise XbtFormatError("Frame directory for '{}' is truncated.".format(path))
+
+            frames = []
+            for _ in range(num_frames):
+                width, height, fmt, packed, unpacked, duration, offset = frame_struct.unpack_from(data, pos)
+                pos += frame_struct.size
+                if offset + packed > file_size:
+                    raise XbtFormatError("Frame data for '{}' lies outside the file.".format(path))
+                frames.append(XbtFrame(self, width, height, fmt, packed, unpacked, duration, offset))
+            textures.append(XbtTexture(path, loop, frames))
+
+        self.header_size = pos
+        self.textures = textures
+
+    def directory_digest(self) -> str:
+        """Fast content hash of the header and texture directory (frame offsets and sizes included)."""
+        return hashlib.blake2b(self.view[:self.header_size], digest_size=16).hexdigest()
+
+    def close(self):
+        """Releases the mapping. Safe to call more than once."""
+        if self.view is not None:
+            try:
+                self.view.release()
+            except BufferError:
+                pass  # Outstanding frame slices keep the mapping alive until collected.
+            self.view = None
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return len(self.textures)
+
+    def __iter__(self):
+        return iter(self.textures)
+
+    def __getitem__(self, index):
+        return self.textures[index]
+
+# --- LZO1X decompression ---
+# python-lzo (the same liblzo2 Kodi's TexturePacker links against) is used when it is installed;
+# otherwise the pure-Python decoder below is used, so frames decode on any platform.
+try:
+    import lzo as _lzo_backend
+except ImportError:
+    _lzo_backend = None
+
+def lzo1x_decompress(src, dst_len, out=None):
+    """
+    Decompresses an LZO1X stream (as written by Kodi's TexturePacker) into a bytearray of dst_len bytes.
+    out may be a preallocated bytearray of at least dst_len bytes to decode into; it is returned.
+    """
+    if out is None:
+        out = bytearray(dst_len)
+    elif len(out) < dst_len:
+        raise ValueError("Output buffer is smaller than {} bytes.".format(dst_len))
+    if _lzo_backend is not None:
+        try:
+            data = _lzo_backend.decompress(bytes(src), False, dst_len)
+        except _lzo_backend.error as e:
+            raise XbtFormatError("LZO stream is corrupt: {}".format(e)) from e
+        if len(data) != dst_len:
+            raise XbtFormatError("LZO stream decoded to {} bytes, expected {}.".format(len(data), dst_len))
+        out[:dst_len] = data
+        return out
+    written = _lzo1x_decompress_python(bytes(src), dst_len, out)
+    if written != dst_len:
+        raise XbtFormatError("LZO stream decoded to {} bytes, expected {}.".format(written, dst_len))
+    return out
+
+def _lzo1x_decompress_python(src, dst_len, out):
+    """
+    Pure-Python LZO1X decoder writing into the preallocated bytearray out; returns the bytes written.
+    Copies are bytearray-to-bytearray slice assignments, the cheapest copy CPython offers for the
+    short runs LZO produces. They are not bounds checked one by one: a copy that runs past the input
+    or the output changes len(out), which is checked once at the end.
+    """
+    ip = op = 0
+    src = bytearray(src)
+    out_len = len(out)
+    # state 0: literal run, 1: first instruction after a literal run, 2: trailing literals then a match, 3: match
+    state = 0
+    try:
+        t = src[0]
+        if t > 17:
+            ip = 1
+            t -= 17
+            if t < 4:
+                state = 2
+            else:
+                out[op:op + t] = src[ip:ip + t]
+                op += t
+                ip += t
+                state = 1
+        while True:
+            if state == 0:
+                t = src[ip]; ip += 1
+                if t >= 16:
+                    state = 3
+                else:
+                    if t == 0:
+                        while src[ip] == 0:
+                            t += 255; ip += 1
+                        t += 15 + src[ip]; ip += 1
+                    t += 3
+                    out[op:op + t] = src[ip:ip + t]
+                    op += t
+                    ip += t
+                    state = 1
+            if state == 1:
+                t = src[ip]; ip += 1
+                if t >= 16:
+                    state = 3
+                else:
+                    # A short match right after a literal run reaches 0x801 bytes further back.
+                    m_pos = op - 0x801 - (t >> 2) - (src[ip] << 2); ip += 1
+                    if m_pos < 0:
+                        raise XbtFormatError("LZO stream references data before the output start.")
+                    out[op:op + 3] = out[m_pos:m_pos + 3]
+                    op += 3
+                    t = src[ip - 2] & 3
+                    if t == 0:
+                        state = 0
+                        continue
+                    state = 2
+
+            # Match loop: each match may be followed by up to 3 literals and then the next match.
+            while True:
+                if state == 2:
+                    out[op:op + t] = src[ip:ip + t]
+                    op += t
+                    ip += t
+                    t = src[ip]; ip += 1
+                if t >= 64:
+                    m_pos = op - 1 - ((t >> 2) & 7) - (src[ip] << 3); ip += 1
+                    length = (t >> 5) + 1
+                elif t >= 32:
+                    length = t & 31
+                    if length == 0:
+                        while src[ip] == 0:
+                            length += 255; ip += 1
+                        length += 31 + src[ip]; ip += 1
+                    m_pos = op - 1 - ((src[ip] | (src[ip + 1] << 8)) >> 2); ip += 2
+                    length += 2
+                elif t >= 16:
+                    m_pos = op - ((t & 8) << 11)
+                    length = t & 7
+                    if length == 0:
+                        while src[ip] == 0:
+                            length += 255; ip += 1
+                        length += 7 + src[ip]; ip += 1
+                    m_pos -= (src[ip] | (src[ip + 1] << 8)) >> 2; ip += 2
+                    if m_pos == op:
+                        # End of stream marker.
+                        if len(out) != out_len:
+                            raise XbtFormatError("LZO stream copies past the end of its input or output.")
+                        return op
+                    m_pos -= 0x4000
+                    length += 2
+                else:
+                    m_pos = op - 1 - (t >> 2) - (src[ip] << 2); ip += 1
+                    length = 2
+
+                if m_pos < 0:
+                    raise XbtFormatError("LZO stream references data before the output start.")
+                distance = op - m_pos
+                if distance >= length:
+                    out[op:op + length] = out[m_pos:m_pos + length]
+                else:
+                    # Overlapping copy: repeat the trailing pattern.
+                    out[op:op + length] = (out[m_pos:op] * (length // distance + 1))[:length]
+                op += length
+                t = src[ip - 2] & 3
+                if t == 0:
+                    break
+                state = 2
+            state = 0
+    except IndexError:
+        raise XbtFormatError("LZO stream is truncated.") from None
+
+def _rgb565_to_bgr(color):
+    r = (color >> 11) & 0x1F
+    g = (color >> 5) & 0x3F
+    b = color & 0x1F
+    return ((b << 3) | (b >> 2), (g << 2) | (g >> 4), (r << 3) | (r >> 2))
+
+def _decode_dxt(data, width, height, fmt):
+    """Decodes DXT1/3/5 block compressed data into BGRA."""
+    out = bytearray(width * height * 4)
+    block_size = 8 if fmt == XBT_FMT_DXT1 else 16
+    blocks_x = (width + 3) // 4
+    blocks_y = (height + 3) // 4
+    pos = 0
+    for by in range(blocks_y):
+        for bx in range(blocks_x):
+            alphas = None
+            if fmt == XBT_FMT_DXT3:
+                bits = int.from_bytes(data[pos:pos + 8], 'little')
+                alphas = [((bits >> (4 * i)) & 0xF) * 17 for i in range(16)]
+                color_pos = pos + 8
+            elif fmt != XBT_FMT_DXT1:
+                a0, a1 = data[pos], data[pos + 1]
+                if a0 > a1:
+                    table = [a0, a1] + [((7 - i) * a0 + i * a1) // 7 for i in range(1, 7)]
+                else:
+                    table = [a0, a1] + [((5 - i) * a0 + i * a1) // 5 for i in range(1, 5)] + [0, 255]
+                bits = int.from_bytes(data[pos + 2:pos + 8], 'little')
+                alphas = [table[(bits >> (3 * i)) & 7] for i in range(16)]
+                color_pos = pos + 8
+            else:
+                color_pos = pos
+
+            c0, c1, indices = struct.unpack_from("<HHI", data, color_pos)
+            p0, p1 = _rgb565_to_bgr(c0), _rgb565_to_bgr(c1)
+            if c0 > c1 or fmt != XBT_FMT_DXT1:
+                palette = [p0 + (255,), p1 + (255,),
+                           tuple((2 * a + b) // 3 for a, b in zip(p0, p1)) + (255,),
+                           tuple((a + 2 * b) // 3 for a, b in zip(p0, p1)) + (255,)]
+            else:
+                palette = [p0 + (255,), p1 + (255,),
+                           tuple((a + b) // 2 for a, b in zip(p0, p1)) + (255,), (0, 0, 0, 0)]
+
+            for i in range(16):
+                x = bx * 4 + (i & 3)
+                y = by * 4 + (i >> 2)
+                if x >= width or y >= height:
+                    continue
+                b, g, r, a = palette[(indices >> (2 * i)) & 3]
+                if alphas is not None:
+                    a = alphas[i]
+                o = (y * width + x) * 4
+                out[o:o + 4] = bytes((b, g, r, a))
+            pos += block_size
+
+    if fmt == XBT_FMT_DXT5_YCOCG:
+        # Stored as (Co, Cg, scale, Y) in the (R, G, B, A) channels.
+        for o in range(0, len(out), 4):
+            scale_raw, cg_raw, co_raw, y = out[o], out[o + 1], out[o + 2], out[o + 3]
+            scale = (scale_raw >> 3) + 1
+            co = (co_raw - 128) // scale
+            cg = (cg_raw - 128) // scale
+            out[o] = max(0, min(255, y - co - cg))
+            out[o + 1] = max(0, min(255, y + cg))
+            out[o + 2] = max(0, min(255, y + co - cg))
+            out[o + 3] = 255
+    return out
+
+def decode_xbt_frame(frame):
+    """Returns the frame's pixels as a BGRA bytearray (width * height * 4 bytes)."""
+    data = frame.payload
+    if frame.is_packed:
+        data = lzo1x_decompress(data, frame.unpacked_size)
+    width, height = frame.width, frame.height
+    pixel_count = width * height
+    fmt = frame.format & XBT_FMT_MASK
+
+    if fmt == XBT_FMT_A8R8G8B8:
+        out = bytearray(data[:pixel_count * 4])
+    elif fmt == XBT_FMT_RGBA8:
+        out = bytearray(data[:pixel_count * 4])
+        out[0::4], out[2::4] = out[2::4], out[0::4]
+    elif fmt == XBT_FMT_RGB8:
+        src = bytes(data[:pixel_count * 3])
+        out = bytearray(b'\xff' * (pixel_count * 4))
+        out[0::4], out[1::4], out[2::4] = src[2::3], src[1::3], src[0::3]
+    elif fmt == XBT_FMT_A8:
+        out = bytearray(b'\xff' * (pixel_count * 4))
+        out[3::4] = bytes(data[:pixel_count])
+    elif fmt in (XBT_FMT_DXT1, XBT_FMT_DXT3, XBT_FMT_DXT5, XBT_FMT_DXT5_YCOCG):
+        return _decode_dxt(bytes(data), width, height, fmt)
+    else:
+        raise XbtFormatError("Unsupported texture format: {}".format(frame.format_name))
+
+    if len(out) != pixel_count * 4:
+        raise XbtFormatError("Frame data is shorter than its {}x{} dimensions.".format(width, height))
+    return out
+
+def decode_xbt_frame_image(frame):
+    """Decodes a frame straight from its XBT payload into a QImage that owns its pixel buffer."""
+    pixels = decode_xbt_frame(frame)
+    # copy() detaches the image from the temporary bytearray, so it stays valid after this returns
+    return QImage(pixels, frame.width, frame.height, frame.width * 4, QImage.Format.Format_ARGB32).copy()
+
+def decode_xbt_frame_thumbnail(frame, max_dim):
+    """
+    Decodes a reduced copy of a frame for thumbnails, at the smallest power-of-two level that is
+    still at least max_dim. Uncompressed formats are point sampled; DXT levels of 1/4 and below are
+    built from one averaged endpoint colour per block, so large DXT textures are never fully decoded.
+    """
+    width, height = frame.width, frame.height
+    step = 1
+    while max(width, height) // (step * 2) >= max_dim:
+        step *= 2
+    fmt = frame.format & XBT_FMT_MASK
+    if step == 1 or fmt == XBT_FMT_DXT5_YCOCG:
+        return decode_xbt_frame_image(frame)
+
+    if fmt in (XBT_FMT_DXT1, XBT_FMT_DXT3, XBT_FMT_DXT5) and step >= 4:
+        data = frame.payload
+        if frame.is_packed:
+            data = lzo1x_decompress(data, frame.unpacked_size)
+        block_size = 8 if fmt == XBT_FMT_DXT1 else 16
+        blocks_x = (width + 3) // 4
+        blocks_y = (height + 3) // 4
+        block_step = step // 4
+        if len(data) < blocks_x * blocks_y * block_size:
+            raise XbtFormatError("Frame data is shorter than its {}x{} dimensions.".format(width, height))
+        out = bytearray()
+        for by in range(0, blocks_y, block_step):
+            for bx in range(0, blocks_x, block_step):
+                pos = (by * blocks_x + bx) * block_size
+                color_pos = pos if fmt == XBT_FMT_DXT1 else pos + 8
+                c0, c1 = struct.unpack_from("<HH", data, color_pos)
+                p0, p1 = _rgb565_to_bgr(c0), _rgb565_to_bgr(c1)
+                if fmt == XBT_FMT_DXT3:
+                    alpha = (data[pos] & 0xF) * 17
+                elif fmt == XBT_FMT_DXT5:
+                    alpha = (data[pos] + data[pos + 1]) // 2
+                else:
+                    alpha = 255
+                out += bytes(((p0[0] + p1[0]) // 2, (p0[1] + p1[1]) // 2, (p0[2] + p1[2]) // 2, alpha))
+        out_width = len(range(0, blocks_x, block_step))
+        out_height = len(range(0, blocks_y, block_step))
+    else:
+        pixels = memoryview(decode_xbt_frame(frame)).cast('I')
+        out = bytearray()
+        for y in range(0, height, step):
+            out += pixels[y * width:(y + 1) * width:step].tobytes()
+        out_width = len(range(0, width, step))
+        out_height = len(range(0, height, step))
+    return QImage(out, out_width, out_height, out_width * 4, QImage.Format.Format_ARGB32).copy()
+
+def xbt_record_cache_path(cache_dir, texture_name):
+    """Maps a texture name to the PNG path used for it inside an info cache directory."""
+    relative = os.path.splitext(texture_name)[0] + ".png"
+    return os.path.normpath(os.path.join(cache_dir, *relative.split('/')))
+
+def scan_file_sizes(root):
+    """
+    Sizes of every file below root from a single os.scandir pass, keyed by os.path.normcase'd relative path.
+    On Windows the sizes come with the directory listing, so no file is stat'ed individually.
+    """
+    sizes = {}
+    stack = [("", root)]
+    while stack:
+        prefix, directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    relative = prefix + entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((relative + os.sep, entry.path))
+                    else:
+                        sizes[os.path.normcase(relative)] = entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
+    return sizes
+
+def ensure_xbt_record_file(reader, record):
+    """
+    Materializes a native Get Info record as a PNG on first use.
+    Returns True if the record's image file exists afterwards.
+    """
+    path = record['path']
+    if os.path.exists(path):
+        return True
+    texture_index = record.get('texture_index', -1)
+    if reader is None or texture_index < 0:
+        return False
+    image = decode_xbt_frame_image(reader[texture_index].frames[0])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if not image.save(path, "PNG"):
+        raise OSError("Could not write {}".format(path))
+    return True
+
+def xbt_extract_frame_path(output_dir, texture_name, frame_number):
+    """Output PNG path of a frame; frames after the first of an animated texture get a _<n> suffix."""
+    path = xbt_record_cache_path(output_dir, texture_name)
+    if frame_number:
+        stem, extension = os.path.splitext(path)
+        path = "{}_{}{}".format(stem, frame_number, extension)
+    return path
+
+def extract_xbt_chunk(xbt_path, output_dir, entries):
+    """
+    Process pool task: decodes one chunk of an XBT frame directory and writes every frame as a PNG.
+    entries holds (texture_name, [(width, height, format, packed_size, unpacked_size, offset), ...]);
+    the file is mapped again here, without re-parsing the directory, so chunks run fully independently.
+    Returns (frames_written, [(texture_name, error), ...]).
+    """
+    written, errors = 0, []
+    with XbtReader(xbt_path, parse_directory=False) as reader:
+        for texture_name, frames in entries:
+            for frame_number, (width, height, fmt, packed_size, unpacked_size, offset) in enumerate(frames):
+                frame = XbtFrame(reader, width, height, fmt, packed_size, unpacked_size, 0, offset)
+                path = xbt_extract_frame_path(output_dir, texture_name, frame_number)
+                try:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    if not decode_xbt_frame_image(frame).save(path, "PNG"):
+                        raise OSError("Could not write {}".format(path))
+                    written += 1
+                except (XbtFormatError, OSError) as e:
+                    errors.append((texture_name, str(e)))
+    return written, errors
+
+def select_xbt_textures(reader, selection):
+    """
+    Resolves a selective-extraction request against a parsed XbtReader and returns sorted texture indexes.
+    selection is either a glob string matched case-insensitively against the texture paths ('*/buttons/*'),
+    or an iterable of texture indexes and/or texture paths. Unknown names and out-of-range indexes are ignored.
+    """
+    if isinstance(selection, str):
+        pattern = selection.replace('\\', '/').lower()
+        return [i for i, texture in enumerate(reader) if fnmatch.fnmatchcase(texture.path.replace('\\', '/').lower(), pattern)]
+    wanted_names, indexes = set(), set()
+    for item in selection:
+        if isinstance(item, str):
+            wanted_names.add(item.replace('\\', '/').lower())
+        elif 0 <= item < len(reader):
+            indexes.add(item)
+    if wanted_names:
+        indexes.update(i for i, texture in enumerate(reader) if texture.path.replace('\\', '/').lower() in wanted_names)
+    return sorted(indexes)
+
+# --- In-memory frame access ---
+# NumPy is optional; without it DecodedFrame.array() is unavailable and callers use buffer or image().
+try:
+    import numpy as _numpy
+except ImportError:
+    _numpy = None
+
+class DecodedFrame:
+    """
+    BGRA pixels of one decoded XBT frame, held in memory instead of written to a PNG.
+    buffer, image() and array() all wrap the same bytearray without copying it, so keep the
+    DecodedFrame alive while they are in use and copy() an image that has to outlive it.
+    """
+    __slots__ = ('texture_index', 'texture_path', 'frame_number', 'width', 'height', 'pixels')
+
+    def __init__(self, texture_index, texture_path, frame_number, width, height, pixels):
+        self.texture_index = texture_index
+        self.texture_path = texture_path
+        self.frame_number = frame_number
+        self.width = width
+        self.height = height
+        self.pixels = pixels
+
+    @property
+    def buffer(self) -> memoryview:
+        """Zero-copy view of the pixels, width * 4 bytes per row in B, G, R, A order."""
+        return memoryview(self.pixels)
+
+    def image(self):
+        """QImage (Format_ARGB32, i.e. BGRA in memory) sharing the pixel buffer."""
+        return QImage(self.pixels, self.width, self.height, self.width * 4, QImage.Format.Format_ARGB32)
+
+    def array(self):
+        """NumPy uint8 array of shape (height, width, 4) sharing the pixel buffer. Requires NumPy."""
+        if _numpy is None:
+            raise ImportError("NumPy is not installed.")
+        return _numpy.frombuffer(self.pixels, dtype=_numpy.uint8).reshape(self.height, self.width, 4)
+
+def iter_xbt_frames(reader, selection=None, all_frames=False):
+    """
+    Yields a DecodedFrame per texture of an open XbtReader, in texture order, decoding one frame at a time.
+    selection narrows the textures as in select_xbt_textures (None yields every texture); only the first
+    frame of an animated texture is decoded unless all_frames is set.
+    """
+    indexes = range(len(reader)) if selection is None else select_xbt_textures(reader, selection)
+    for texture_index in indexes:
+        texture = reader[texture_index]
+        for frame_number, frame in enumerate(texture.frames if all_frames else texture.frames[:1]):
+            yield DecodedFrame(texture_index, texture.path, frame_number, frame.width, frame.height, decode_xbt_frame(frame))
+
+# --- XBT writing ---
+# ---- Mirrors Kodi's TexturePacker: the same directory walk order, BGRA (A8R8G8B8) frames flagged
+# ---- OPAQUE when no pixel has alpha, lzo1x_999 packing kept only when it saves space.
+XBT_SOURCE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif') # What TexturePacker's decoders accept
+XBT_LZO_LEVEL = 8 # python-lzo level 8 is lzo1x_999_compress, TexturePacker's packer
+SOURCE_SCAN_THREADS = 8 # Listing, stat and header reads mostly wait on the disk, so threads overlap them
+
+def _list_source_directory(directory):
+    """scan_xbt_sources task: one directory's subdirectories and images as (name, path, is_dir, size, mtime_ns)."""
+    entries = []
+    with os.scandir(directory) as iterator:
+        for entry in iterator:
+            if entry.is_dir():
+                entries.append((entry.name, entry.path, True, 0, 0))
+            elif os.path.splitext(entry.name)[1].lower() in XBT_SOURCE_EXTENSIONS:
+                stat = entry.stat()
+                entries.append((entry.name, entry.path, False, stat.st_size, stat.st_mtime_ns))
+    return entries
+
+def scan_xbt_sources(input_dir, max_workers=SOURCE_SCAN_THREADS):
+    """
+    Lists the images a compile packs as (texture_name, full_path, size, mtime_ns), texture names using '/'.
+    Directories are listed and stat'ed concurrently on a thread pool, then stitched together depth-first
+    in os.scandir order, as TexturePacker's readdir walk does, so the texture directory comes out the same.
+    """
+    listings = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = {pool.submit(_list_source_directory, input_dir): input_dir}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                directory = pending.pop(future)
+                listings[directory] = future.result()
+                for _, path, is_dir, _, _ in listings[directory]:
+                    if is_dir:
+                        pending[pool.submit(_list_source_directory, path)] = path
+
+    sources = []
+    def walk(directory, prefix):
+        for name, path, is_dir, size, mtime_ns in listings[directory]:
+            if is_dir:
+                walk(path, prefix + name + "/")
+            else:
+                sources.append((prefix + name, path, size, mtime_ns))
+    walk(input_dir, "")
+    return sources
+
+IMAGE_HEADER_PROBE_BYTES = 512
+_JPEG_SOF_MARKERS = frozenset((0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF))
+
+def _probe_jpeg_header(f):
+    """Walks JPEG segment markers up to the first SOFn, seeking over segment bodies. (width, height) or None."""
+    f.seek(2)
+    while True:
+        marker = f.read(2)
+        while len(marker) == 2 and marker[1] == 0xFF:  # fill bytes before a marker
+            marker = marker[1:] + f.read(1)
+        if len(marker) < 2 or marker[0] != 0xFF or marker[1] in (0xD9, 0xDA):
+            return None
+        if marker[1] == 0x01 or 0xD0 <= marker[1] <= 0xD7:  # standalone markers, no length
+            continue
+        segment = f.read(2)
+        if len(segment) < 2:
+            return None
+        (length,) = struct.unpack(">H", segment)
+        if marker[1] in _JPEG_SOF_MARKERS:
+            body = f.read(5)
+            if len(body) < 5:
+                return None
+            height, width = struct.unpack_from(">HH", body, 1)
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+def probe_image_header(path):
+    """
+    (width, height, format) of an image read from its header only, format being e.g. 'png'; (0, 0, '') if unreadable.
+    PNG (IHDR), GIF, BMP and JPEG (first SOFn marker) are parsed from the first IMAGE_HEADER_PROBE_BYTES bytes,
+    JPEGs seeking further over their segments; anything else falls back to a QImageReader.
+    """
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(IMAGE_HEADER_PROBE_BYTES)
+            if head[:8] == b"\x89PNG\r\n\x1a\n" and head[12:16] == b"IHDR":
+                width, height = struct.unpack_from(">II", head, 16)
+                return width, height, 'png'
+            if head[:6] in (b"GIF87a", b"GIF89a"):
+                width, height = struct.unpack_from("<HH", head, 6)
+                return width, height, 'gif'
+            if head[:2] == b"BM" and len(head) >= 26:
+                if struct.unpack_from("<I", head, 14)[0] == 12:  # OS/2 BITMAPCOREHEADER
+                    width, height = struct.unpack_from("<HH", head, 18)
+                else:
+                    width, height = struct.unpack_from("<ii", head, 18)
+                return abs(width), abs(height), 'bmp'
+            if head[:2] == b"\xff\xd8":
+                size = _probe_jpeg_header(f)
+                return (size[0], size[1], 'jpeg') if size else (0, 0, '')
+    except (OSError, struct.error):
+        return 0, 0, ''
+    reader = QImageReader(path)
+    size = reader.size()
+    if not size.isValid():
+        return 0, 0, ''
+    return size.width(), size.height(), bytes(reader.format()).decode('ascii', 'replace')
+
+def probe_image_headers(paths, max_workers=SOURCE_SCAN_THREADS):
+    """probe_image_header over many files on a thread pool, results in input order."""
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(probe_image_header, paths, chunksize=64))
+
+def diff_compile_sources(sources, manifest):
+    """
+    Compares a scan_xbt_sources listing with the manifest of the previous build (see load_xbt_compile_manifest).
+    Returns (added, changed, unchanged, removed): lists of sources, except removed, which holds texture names.
+    unchanged means the same size and mtime; a changed file may still turn out identical by content hash.
+    """
+    added, changed, unchanged = [], [], []
+    for source in sources:
+        known = manifest.get(source[0])
+        if known is None:
+            added.append(source)
+        elif known[:2] == source[2:4]:
+            unchanged.append(source)
+        else:
+            changed.append(source)
+    names = {source[0] for source in sources}
+    removed = [name for name in manifest if name not in names]
+    return added, changed, unchanged, removed
+
+def xbt_compile_manifest_path(output_path):
+    """Sidecar file recording which source files the last native compile packed into output_path."""
+    return output_path + ".manifest.json"
+
+def load_xbt_compile_manifest(output_path):
+    """
+    Returns {texture_name: (size, mtime_ns, digest, pixel_digest, width, height, format)} of the sources packed
+    into output_path by the last native compile, or {} when there is no manifest or the .xbt was changed since.
+    """
+    try:
+        with open(xbt_compile_manifest_path(output_path), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        stat = os.stat(output_path)
+        if manifest.get('version') != 3 or manifest.get('xbt') != [stat.st_size, stat.st_mtime_ns]:
+            return {}
+        return {name: tuple(entry) for name, entry in manifest['files'].items()}
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return {}
+
+def save_xbt_compile_manifest(output_path, files):
+    """Writes the manifest for a freshly written output_path; files maps texture_name to the tuples load_xbt_compile_manifest returns."""
+    stat = os.stat(output_path)
+    path = xbt_compile_manifest_path(output_path)
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump({'version': 3, 'xbt': [stat.st_size, stat.st_mtime_ns], 'files': files}, f)
+    os.replace(path + ".tmp", path)
+
+def read_xbt_source_frames(path):
+    """Decodes every frame of a source image (GIFs may be animated) to BGRA. Returns [(pixels, width, height, duration_ms)]."""
+    reader = QImageReader(path)
+    reader.setAllocationLimit(0)
+    frames = []
+    for _ in range(max(reader.imageCount(), 1)):
+        image = reader.read()
+        if image.isNull():
+            break
+        duration = reader.nextImageDelay() if reader.supportsAnimation() else 0
+        image = image.convertToFormat(QImage.Format.Format_ARGB32)
+        width, height = image.width(), image.height()
+        frames.append((bytes(image.constBits())[:width * height * 4], width, height, duration))
+    if not frames:
+        raise OSError("Could not decode {}: {}".format(path, reader.errorString()))
+    return frames
+
+def encode_xbt_frame(pixels, width, height, duration=0):
+    """
+    Packs one BGRA frame the way TexturePacker does. Needs python-lzo.
+    Returns ((width, height, format, packed_size, unpacked_size, duration), payload).
+    """
+    fmt = XBT_FMT_A8R8G8B8 if pixels[3::4].rstrip(b'\xff') else XBT_FMT_A8R8G8B8 | XBT_FMT_OPAQUE
+    payload = _lzo_backend.compress(bytes(pixels), XBT_LZO_LEVEL, False)
+    if len(payload) >= len(pixels):
+        payload = pixels # Readers take packed == unpacked to mean stored raw
+    return (width, height, fmt, len(payload), len(pixels), duration), payload
+
+def xbt_source_digest(path):
+    """Content hash of a source image file, as recorded in the compile manifest."""
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+def xbt_pixel_digest(frames):
+    """
+    Dupecheck key of a decoded texture: a hash over every frame's size, duration and BGRA pixels, so images
+    that decode identically match whatever their file format or metadata chunks.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for pixels, width, height, duration in frames:
+        h.update(struct.pack("<III", width, height, duration))
+        h.update(pixels)
+    return h.hexdigest()
+
+def encode_xbt_source_chunk(sources):
+    """
+    Process pool task: decodes and packs one chunk of (texture_name, full_path, known_digest) sources.
+    Returns [(texture_name, frames, payloads, digest, pixel_digest, hash_seconds, error)] in input order;
+    error is None on success. frames and pixel_digest are None when the file's digest equals known_digest,
+    i.e. the previously packed frames still apply.
+    """
+    results = []
+    for texture_name, path, known_digest in sources:
+        try:
+            digest = xbt_source_digest(path)
+            if digest == known_digest:
+                results.append((texture_name, None, None, digest, None, 0.0, None))
+                continue
+            decoded = read_xbt_source_frames(path)
+            started = time.perf_counter()
+            pixel_digest = xbt_pixel_digest(decoded)
+            hash_seconds = time.perf_counter() - started
+            encoded = [encode_xbt_frame(*frame) for frame in decoded]
+            results.append((texture_name, [frame for frame, _ in encoded], [payload for _, payload in encoded],
+                            digest, pixel_digest, hash_seconds, None))
+        except (OSError, ValueError) as e:
+            results.append((texture_name, None, None, None, None, 0.0, str(e)))
+    return results
+
+class XbtWriter:
+    """
+    Streams an XBT bundle to disk. Frame payloads are appended to a spool file as they arrive; finish()
+    writes the header and texture directory, whose size is only known once every frame is in, followed
+    by the spooled payloads, and moves the result over output_path. Use as a context manager so an
+    unfinished write is cleaned up.
+    """
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self.textures = [] # (encoded path, loop, [(width, height, format, packed, unpacked, duration, data offset)])
+        self.data_size = 0
+        self._spool_path = output_path + ".data.tmp"
+        self._spool = open(self._spool_path, 'wb')
+
+    def add_texture(self, texture_name, frames, payloads, loop=0):
+        """Appends a texture; frames are (width, height, format, packed_size, unpacked_size, duration) tuples."""
+        encoded_name = texture_name.encode('utf-8')
+        if len(encoded_name) >= XBT_MAX_PATH:
+            raise XbtFormatError("Texture path is longer than {} bytes: {}".format(XBT_MAX_PATH - 1, texture_name))
+        entries = []
+        for frame, payload in zip(frames, payloads):
+            entries.append(tuple(frame) + (self.data_size,))
+            self._spool.write(payload)
+            self.data_size += frame[3]
+        self.textures.append((encoded_name, loop, entries))
+
+    def add_alias(self, texture_name, original, loop=0):
+        """Appends a texture whose frames point at the payloads of the earlier texture number original (dupecheck)."""
+        encoded_name = texture_name.encode('utf-8')
+        if len(encoded_name) >= XBT_MAX_PATH:
+            raise XbtFormatError("Texture path is longer than {} bytes: {}".format(XBT_MAX_PATH - 1, texture_name))
+        self.textures.append((encoded_name, loop, list(self.textures[original][2])))
+
+    def finish(self):
+        """Writes the finished bundle to output_path. Returns its size in bytes."""
+        self._spool.close()
+        header_size = len(XBT_MAGIC) + len(XBT_VERSION) + 4 + sum(
+            XBT_MAX_PATH + _XBT_FILE_STRUCT.size + len(frames) * _XBT_FRAME_STRUCT.size for _, _, frames in self.textures)
+        header = bytearray(XBT_MAGIC + XBT_VERSION + struct.pack("<I", len(self.textures)))
+        for encoded_name, loop, frames in self.textures:
+            header += encoded_name.ljust(XBT_MAX_PATH, b'\0')
+            header += _XBT_FILE_STRUCT.pack(loop, len(frames))
+            for width, height, fmt, packed, unpacked, duration, offset in frames:
+                header += _XBT_FRAME_STRUCT.pack(width, height, fmt, packed, unpacked, duration, header_size + offset)
+        temp_path = self.output_path + ".tmp"
+        with open(temp_path, 'wb') as out, open(self._spool_path, 'rb') as spool:
+            out.write(header)
+            shutil.copyfileobj(spool, out, 1024 * 1024)
+        os.replace(temp_path, self.output_path)
+        os.remove(self._spool_path)
+        return header_size + self.data_size
+
+    def abort(self):
+        """Discards the partial write. Safe to call more than once."""
+        self._spool.close()
+        for path in (self._spool_path, self.output_path + ".tmp"):
+            with contextlib.suppress(OSError):
+                os.remove(path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+
+# --- Perceptual near-duplicate detection ---
+# ---- 64-bit difference hashes (dHash) compared by Hamming distance. Qt does the resampling,
+# ---- so only the final 9x8 sample is touched from Python.
+NEAR_DUPLICATE_DISTANCE = 4 # Hashes at most this many bits apart count as the same picture
+DHASH_SOURCE_SIZE = 64 # Images are decoded at roughly this size before the 9x8 sample is taken
+
+def dhash_image(image):
+    """
+    Difference hash of a QImage: the picture is shrunk to 9x8, converted to luma with transparent pixels
+    counting as black, and each bit records whether a pixel is darker than its right-hand neighbour.
+    """
+    small = image.convertToFormat(QImage.Format.Format_ARGB32).scaled(
+        9, 8, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
+    pixels = bytes(small.constBits())
+    stride = small.bytesPerLine()
+    value = 0
+    for y in range(8):
+        row = pixels[y * stride:y * stride + 36]
+        # BGRA: luma weighted by alpha, so hidden colour under transparent pixels does not matter
+        luma = [(row[o + 2] * 299 + row[o + 1] * 587 + row[o] * 114) * row[o + 3] for o in range(0, 36, 4)]
+        for x in range(8):
+            value = (value << 1) | (luma[x] < luma[x + 1])
+    return value
+
+def perceptual_hash_chunk(xbt_path, locators):
+    """
+    Process pool task: dHash of each locator, in order, or None where the image cannot be read.
+    Locators are source image paths, or (width, height, format, packed_size, unpacked_size, offset)
+    frame tuples of the XBT file at xbt_path, which is mapped here without re-parsing its directory.
+    """
+    hashes = []
+    reader = XbtReader(xbt_path, parse_directory=False) if xbt_path else None
+    try:
+        for locator in locators:
+            try:
+                if reader is not None:
+                    width, height, fmt, packed_size, unpacked_size, offset = locator
+                    frame = XbtFrame(reader, width, height, fmt, packed_size, unpacked_size, 0, offset)
+                    image = decode_xbt_frame_thumbnail(frame, DHASH_SOURCE_SIZE)
+                else:
+                    image_reader = QImageReader(locator)
+                    image_reader.setAllocationLimit(0)
+                    size = image_reader.size()
+                    if size.width() > DHASH_SOURCE_SIZE or size.height() > DHASH_SOURCE_SIZE:
+                        image_reader.setScaledSize(size.scaled(DHASH_SOURCE_SIZE, DHASH_SOURCE_SIZE, Qt.AspectRatioMode.KeepAspectRatio))
+                    image = image_reader.read()
+                    if image.isNull():
+                        raise OSError(image_reader.errorString())
+                hashes.append(dhash_image(image))
+            except (XbtFormatError, OSError, ValueError):
+                hashes.append(None)
+    finally:
+        if reader is not None:
+            reader.close()
+    return hashes
+
+def near_duplicate_clusters(hashes, max_distance=NEAR_DUPLICATE_DISTANCE):
+    """
+    Groups items whose 64-bit hashes lie within max_distance bits of each other, transitively.
+    hashes maps item -> hash; returns the clusters (lists of items) with at least two members.
+    Candidates come from max_distance + 1 disjoint bit bands: two hashes that close must agree exactly on
+    at least one band (pigeonhole), so only items sharing a band value are compared, never all n² pairs.
+    """
+    by_hash = {}
+    for item, value in hashes.items():
+        by_hash.setdefault(value, []).append(item)
+    unique = list(by_hash)
+    parent = list(range(len(unique)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    bands = max_distance + 1
+    bounds = [64 * band // bands for band in range(bands + 1)]
+    for low, high in zip(bounds, bounds[1:]):
+        mask = (1 << (high - low)) - 1
+        buckets = {}
+        for i, value in enumerate(unique):
+            buckets.setdefault((value >> low) & mask, []).append(i)
+        for members in buckets.values():
+            for position, a in enumerate(members):
+                for b in members[position + 1:]:
+                    root_a, root_b = find(a), find(b)
+                    if root_a != root_b and bin(unique[a] ^ unique[b]).count('1') <= max_distance:
+                        parent[root_b] = root_a
+
+    clusters = {}
+    for i, value in enumerate(unique):
+        clusters.setdefault(find(i), []).extend(by_hash[value])
+    return [items for items in clusters.values() if len(items) > 1]
+
+class TextureRecord:
+    """Dict-like view of one TextureTable row, so record['filename'] / record.get('dimensions') call sites keep working."""
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, key):
+        return self._table._get(self._row, key)
+
+    def __setitem__(self, key, value):
+        self._table._set(self._row, key, value)
+
+    def get(self, key, default=None):
+        try:
+            return self._table._get(self._row, key)
+        except KeyError:
+            return default
+
+    def keys(self):
+        return self._table._row_keys(self._row)
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __repr__(self):
+        return "TextureRecord({!r})".format(dict(self.items()))
+
+class TextureTable:
+    """
+    Columnar store for the previewer's texture records. Names live in one UTF-8 pool addressed by
+    uint32 offsets, dimensions are uint16 columns, formats an enum into a per-table name list and sizes
+    uint64 columns (an XBT frame's packed size is a 64-bit field). Indexing returns a TextureRecord view, so the list-of-dicts API is preserved.
+    Record paths are derived from cache_dir unless a row was added with a different one.
+    """
+    FIELDS = ('path', 'filename', 'dimensions', 'format', 'size', 'packed_size', 'unpacked_size', 'frames', 'texture_index', 'offset')
+    _COLUMNS = ('_name_offsets', '_widths', '_heights', '_formats', '_sizes', '_unpacked_sizes', '_frames', '_texture_indexes', '_offsets')
+    _INT_COLUMNS = {'size': ('_sizes', 0xFFFFFFFFFFFFFFFF), 'packed_size': ('_sizes', 0xFFFFFFFFFFFFFFFF),
+                    'unpacked_size': ('_unpacked_sizes', 0xFFFFFFFFFFFFFFFF),
+                    'frames': ('_frames', 0xFFFF), 'texture_index': ('_texture_indexes', 0x7FFFFFFF), 'offset': ('_offsets', 0xFFFFFFFFFFFFFFFF)}
+    _INT_DEFAULTS = {'size': 0, 'unpacked_size': 0, 'frames': 0, 'texture_index': -1, 'offset': 0}
+    # Upper bounds of the packed size facet buckets; the last bucket is open ended.
+    SIZE_BUCKET_EDGES = (4 * 1024, 16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024)
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self._reset_columns()
+
+    def _reset_columns(self):
+        self._name_pool = bytearray()
+        self._name_offsets = array('I', [0])
+        self._widths = array('H')
+        self._heights = array('H')
+        self._formats = array('H')
+        self._format_names = []
+        self._format_ids = {}
+        self._sizes = array('Q')
+        self._unpacked_sizes = array('Q')
+        self._frames = array('H')
+        self._texture_indexes = array('i')
+        self._offsets = array('Q')
+        self._paths = {} # row -> path, only for rows whose path is not derived from cache_dir
+        self._extra = {} # row -> {key: value} for keys and values that don't fit a column
+        self._facets = None
+
+    def __len__(self):
+        return len(self._widths)
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("texture index out of range")
+        return TextureRecord(self, row)
+
+    def __iter__(self):
+        return (TextureRecord(self, row) for row in range(len(self)))
+
+    def clear(self):
+        self._reset_columns()
+
+    def name(self, row):
+        return self._name_pool[self._name_offsets[row]:self._name_offsets[row + 1]].decode('utf-8')
+
+    def names(self, start=0):
+        """Yields every filename (from row start on) in row order without building record views."""
+        pool, offsets = self._name_pool, self._name_offsets
+        for row in range(start, len(self)):
+            extra = self._extra.get(row)
+            if extra and 'filename' in extra:
+                yield extra['filename']
+            else:
+                yield pool[offsets[row]:offsets[row + 1]].decode('utf-8')
+
+    def _format_id(self, format_name):
+        format_id = self._format_ids.get(format_name)
+        if format_id is None:
+            format_id = len(self._format_names)
+            self._format_names.append(format_name)
+            self._format_ids[format_name] = format_id
+        return format_id
+
+    def _derived_path(self, filename):
+        return xbt_record_cache_path(self.cache_dir, filename) if self.cache_dir else None
+
+    def add(self, filename, width=0, height=0, format_name='N/A', size=0, unpacked_size=0, frames=0, texture_index=-1, offset=0, path=None):
+        """Appends a row from plain values (the fast path used when reading an XBT directory). Returns the row."""
+        self._facets = None
+        row = len(self)
+        self._name_pool += filename.encode('utf-8')
+        self._name_offsets.append(len(self._name_pool))
+        self._widths.append(0)
+        self._heights.append(0)
+        self._formats.append(self._format_id(format_name))
+        self._sizes.append(0)
+        self._unpacked_sizes.append(0)
+        self._frames.append(0)
+        self._texture_indexes.append(-1)
+        self._offsets.append(0)
+        if width and height:
+            self._set(row, 'dimensions', (width, height))
+        for key, value in (('size', size), ('unpacked_size', unpacked_size), ('frames', frames), ('texture_index', texture_index), ('offset', offset)):
+            if value != self._INT_DEFAULTS[key]:
+                self._set(row, key, value)
+        if path is not None and path != self._derived_path(filename):
+            self._paths[row] = path
+        return row
+
+    def append(self, record):
+        """Appends a record dict (or another table's TextureRecord)."""
+        row = self.add(record['filename'], format_name=record.get('format', 'N/A'), size=record.get('size', 0),
+                       unpacked_size=record.get('unpacked_size', 0), frames=record.get('frames', 0),
+                       texture_index=record.get('texture_index', -1), offset=record.get('offset', 0), path=record.get('path'))
+        self._set(row, 'dimensions', record.get('dimensions', 'N/A'))
+        for key, value in record.items():
+            if key not in self.FIELDS:
+                self._set(row, key, value)
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def set_sizes(self, sizes):
+        """Replaces the size column in bulk, e.g. from one directory scan. sizes must hold one value per row."""
+        if len(sizes) != len(self):
+            raise ValueError("Expected {} sizes, got {}".format(len(self), len(sizes)))
+        self._facets = None
+        self._sizes = array('Q', sizes)
+        for extra in self._extra.values():
+            extra.pop('size', None)
+        self._extra = {row: values for row, values in self._extra.items() if values}
+
+    def extend_table(self, other):
+        """Appends every row of another TextureTable with bulk column copies (used for streamed batches)."""
+        base, pool_base = len(self), len(self._name_pool)
+        self._facets = None
+        self._name_pool += other._name_pool
+        self._name_offsets.extend(offset + pool_base for offset in other._name_offsets[1:])
+        format_ids = [self._format_id(format_name) for format_name in other._format_names]
+        self._formats.extend(format_ids[format_id] for format_id in other._formats)
+        for column_name in ('_widths', '_heights', '_sizes', '_unpacked_sizes', '_frames', '_texture_indexes', '_offsets'):
+            getattr(self, column_name).extend(getattr(other, column_name))
+        if other.cache_dir != self.cache_dir:
+            for row in range(len(other)):
+                path = other._get(row, 'path')
+                if path is not None and path != self._derived_path(other.name(row)):
+                    self._paths[base + row] = path
+        else:
+            self._paths.update((base + row, path) for row, path in other._paths.items())
+        self._extra.update((base + row, dict(values)) for row, values in other._extra.items())
+
+    def sort(self, key=None, reverse=False):
+        """Sorts rows in place like list.sort(); key receives a TextureRecord."""
+        if key is None:
+            key = lambda record: record['filename']
+        order = sorted(range(len(self)), key=lambda row: key(TextureRecord(self, row)), reverse=reverse)
+        names = [self.name(row) for row in order]
+        self._name_pool = bytearray()
+        self._name_offsets = array('I', [0])
+        for name in names:
+            self._name_pool += name.encode('utf-8')
+            self._name_offsets.append(len(self._name_pool))
+        for column_name in self._COLUMNS[1:]:
+            column = getattr(self, column_name)
+            setattr(self, column_name, array(column.typecode, (column[row] for row in order)))
+        new_row = {old: new for new, old in enumerate(order)}
+        self._paths = {new_row[row]: path for row, path in self._paths.items()}
+        self._extra = {new_row[row]: values for row, values in self._extra.items()}
+
+    def _row_keys(self, row):
+        extra = self._extra.get(row)
+        return list(self.FIELDS) + [key for key in extra if key not in self.FIELDS] if extra else list(self.FIELDS)
+
+    def _get(self, row, key):
+        extra = self._extra.get(row)
+        if extra and key in extra:
+            return extra[key]
+        if key == 'filename':
+            return self.name(row)
+        if key == 'path':
+            path = self._paths.get(row)
+            return path if path is not None else self._derived_path(self.name(row))
+        if key == 'dimensions':
+            width, height = self._widths[row], self._heights[row]
+            return "{}x{}".format(width, height) if width and height else 'N/A'
+        if key == 'format':
+            return self._format_names[self._formats[row]]
+        column = self._INT_COLUMNS.get(key)
+        if column is not None:
+            return getattr(self, column[0])[row]
+        raise KeyError(key)
+
+    def _set(self, row, key, value):
+        self._facets = None
+        extra = self._extra.get(row)
+        if extra:
+            extra.pop(key, None)
+            if not extra:
+                del self._extra[row]
+        if key == 'path':
+            self._paths[row] = value
+            return
+        if key == 'format':
+            self._formats[row] = self._format_id(str(value))
+            return
+        if key == 'dimensions':
+            if isinstance(value, tuple):
+                width, height = value
+            else:
+                width, height = parse_dimensions(value)
+            if 0 < width <= 0xFFFF and 0 < height <= 0xFFFF:
+                self._widths[row], self._heights[row] = width, height
+                return
+            self._widths[row] = self._heights[row] = 0
+            if value in ('N/A', '', None, (0, 0)):
+                return
+            value = "{}x{}".format(width, height) if isinstance(value, tuple) else value
+        column = self._INT_COLUMNS.get(key)
+        if column is not None:
+            if isinstance(value, int) and (-1 if key == 'texture_index' else 0) <= value <= column[1]:
+                getattr(self, column[0])[row] = value
+                return
+            # Kept in _extra only; the column must not keep a stale value for the facet and query paths.
+            getattr(self, column[0])[row] = -1 if key == 'texture_index' else 0
+        self._extra.setdefault(row, {})[key] = value
+
+    def rows_with_dimensions(self, dimensions):
+        """Rows whose dimensions equal a 'WxH' string (case-insensitive), compared on the integer columns."""
+        width, height = parse_dimensions(dimensions)
+        rows = []
+        if width and height:
+            rows = [row for row, (w, h) in enumerate(zip(self._widths, self._heights)) if w == width and h == height]
+        query = dimensions.lower()
+        rows.extend(row for row, extra in self._extra.items() if str(extra.get('dimensions', '')).lower() == query)
+        return sorted(rows)
+
+    @classmethod
+    def size_bucket_range(cls, bucket):
+        """(lowest, highest exclusive or None) packed size of a size facet bucket."""
+        edges = cls.SIZE_BUCKET_EDGES
+        return (edges[bucket - 1] if bucket else 0), (edges[bucket] if bucket < len(edges) else None)
+
+    def facets(self):
+        """
+        Counts per dimensions ('WxH'), format name, packed size bucket (see SIZE_BUCKET_EDGES) and
+        directory prefix ('a/', 'a/b/', ...). Computed in one pass over the columns and cached until
+        the table changes; the metadata index stores them so a cache hit never rescans.
+        """
+        if self._facets is not None:
+            return self._facets
+        dimensions = {"{}x{}".format(w, h): count for (w, h), count in Counter(zip(self._widths, self._heights)).items() if w and h}
+        for extra in self._extra.values():
+            if 'dimensions' in extra:
+                dimensions[extra['dimensions']] = dimensions.get(extra['dimensions'], 0) + 1
+        formats = {self._format_names[format_id]: count for format_id, count in Counter(self._formats).items()}
+        edges = self.SIZE_BUCKET_EDGES
+        sizes = {str(bucket): count for bucket, count in Counter(bisect.bisect_right(edges, size) for size in self._sizes).items()}
+        directories = Counter()
+        for name in self.names():
+            end = name.find('/')
+            while end != -1:
+                directories[name[:end + 1]] += 1
+                end = name.find('/', end + 1)
+        self._facets = {'dimensions': dimensions, 'format': formats, 'size': sizes, 'directory': dict(directories)}
+        return self._facets
+
+    def rows_with_format(self, format_name):
+        """Rows whose format name is exactly format_name."""
+        format_id = self._format_ids.get(format_name)
+        rows = [] if format_id is None else [row for row, value in enumerate(self._formats) if value == format_id]
+        rows.extend(row for row, extra in self._extra.items() if extra.get('format') == format_name)
+        return sorted(rows)
+
+    def to_bytes(self):
+        """Serializes the columns for the metadata index. Explicit paths are session specific and not stored."""
+        meta = json.dumps({'rows': len(self), 'formats': self._format_names,
+                           'extra': {str(row): values for row, values in self._extra.items()}}).encode('utf-8')
+        parts = [struct.pack("<II", len(meta), len(self._name_pool)), meta, bytes(self._name_pool)]
+        parts.extend(getattr(self, column_name).tobytes() for column_name in self._COLUMNS)
+        return zlib.compress(b"".join(parts))
+
+    @classmethod
+    def from_bytes(cls, blob, cache_dir=None):
+        data = zlib.decompress(blob)
+        meta_size, pool_size = struct.unpack_from("<II", data, 0)
+        pos = 8
+        meta = json.loads(data[pos:pos + meta_size].decode('utf-8'))
+        pos += meta_size
+        table = cls(cache_dir)
+        table._name_pool = bytearray(data[pos:pos + pool_size])
+        pos += pool_size
+        rows = meta['rows']
+        for column_name in cls._COLUMNS:
+            column = array(getattr(table, column_name).typecode)
+            count = rows + 1 if column_name == '_name_offsets' else rows
+            column.frombytes(data[pos:pos + count * column.itemsize])
+            if len(column) != count:
+                raise ValueError("Truncated texture table")
+            pos += count * column.itemsize
+            setattr(table, column_name, column)
+        table._format_names = meta['formats']
+        table._format_ids = {name: i for i, name in enumerate(table._format_names)}
+        table._extra = {int(row): values for row, values in meta['extra'].items()}
+        return table
+
+def parse_dimensions(dimensions):
+    """Parses 'WxH' into (width, height); returns (0, 0) if it isn't one."""
+    try:
+        width, height = str(dimensions).lower().split('x')
+        return int(width), int(height)
+    except (ValueError, AttributeError):
+        return 0, 0
+
+class TextureSearchIndex:
+    """
+    Filename search over a gallery, built once per Get Info and extended as rows stream in.
+    Query forms: plain text is a case-insensitive substring match, '^text' a prefix match, text with
+    * ? or [ a glob against the whole name and '/expr/' a regular expression. Prefixes use a sorted
+    lowercase name array; substring and glob candidates come from trigram postings (when built) and
+    are verified against the names. A query that extends the previous one only filters its results.
+    Searches can be paged with limit and after, so a broad query only verifies the rows it returns.
+    """
+    def __init__(self, names, build_postings=True):
+        self.names = [name.lower() for name in names]
+        self.sorted_names = []
+        self.sorted_rows = array('I')
+        self._sort_new_rows()
+        self.postings = self._build_postings(self.names) if build_postings else None
+        self._last = None # (mode, term, rows) of the previous complete query
+
+    def extend(self, names):
+        """Appends rows streamed in after the index was built. The sorted name array catches up on the next prefix query."""
+        start = len(self.names)
+        self.names.extend(name.lower() for name in names)
+        if self.postings is not None:
+            self._add_postings(self.postings, self.names, start)
+        self._last = None
+
+    @classmethod
+    def _build_postings(cls, names):
+        postings = {}
+        cls._add_postings(postings, names, 0)
+        return postings
+
+    @staticmethod
+    def _add_postings(postings, names, start):
+        for row in range(start, len(names)):
+            name = names[row]
+            for gram in {name[i:i + 3] for i in range(len(name) - 2)}:
+                rows = postings.get(gram)
+                if rows is None:
+                    postings[gram] = array('I', (row,))
+                else:
+                    rows.append(row)
+
+    @staticmethod
+    def parse(query):
+        """Returns (mode, term) for a search box query."""
+        query = query.strip()
+        if len(query) > 2 and query.startswith('/') and query.endswith('/'):
+            return 'regex', query[1:-1]
+        query = query.lower()
+        if query.startswith('^'):
+            return 'prefix', query[1:]
+        if any(c in query for c in '*?['):
+            return 'glob', query
+        return 'substring', query
+
+    def search(self, query, limit=None, after=-1):
+        """
+        Returns the matching rows in ascending order: only rows past after, and at most limit of them.
+        Raises re.error for an invalid regular expression.
+        """
+        mode, term = self.parse(query)
+        if not term:
+            return []
+        last = self._last
+        test = None # Candidates are exact when there is nothing to verify
+        if mode == 'prefix':
+            candidates = self._prefix_rows(term)
+        elif mode == 'substring':
+            if last is not None and last[0] == 'substring' and last[1] in term:
+                candidates, exact = last[2], False
+            else:
+                # A three character term is exactly one trigram's postings.
+                candidates, exact = self._candidates([term]), len(term) == 3 and self.postings is not None
+            if not exact:
+                test = re.compile(re.escape(term)).search
+        elif mode == 'glob':
+            literals = [part for part in re.split(r'[*?]|\[[^\]]*\]', term) if len(part) >= 3]
+            candidates = self._candidates(literals)
+            test = re.compile(fnmatch.translate(term)).match
+        else:
+            candidates = self._candidates(self._regex_literals(term))
+            test = re.compile(term, re.IGNORECASE).search
+        rows = self._collect(candidates, test, limit, after)
+        if after < 0 and (limit is None or len(rows) < limit):
+            self._last = (mode, term, rows)
+        return rows
+
+    def _collect(self, candidates, test, limit, after):
+        """The ascending candidates past after that pass test, stopping once limit rows are found."""
+        if after >= 0:
+            candidates = candidates[bisect.bisect_right(candidates, after):]
+        if test is None:
+            return list(candidates if limit is None else candidates[:limit])
+        names = self.names
+        if limit is None:
+            return [row for row in candidates if test(names[row])]
+        rows = []
+        for row in candidates:
+            if test(names[row]):
+                rows.append(row)
+                if len(rows) == limit:
+                    break
+        return rows
+
+    @staticmethod
+    def _regex_literals(term):
+        """
+        Literal runs every match of a simple regular expression must contain, for trigram narrowing.
+        Patterns with groups, alternation, classes or numeric escapes are not analysed and return no literals.
+        """
+        if any(c in term for c in '|([') or re.search(r'\\[^dDwWsSbB\W]', term):
+            return []
+        literals, run, i = [], "", 0
+        while i < len(term):
+            c = term[i]
+            if c == '\\' and i + 1 < len(term) and not term[i + 1].isalnum():
+                char, i = term[i + 1], i + 2
+            elif c == '{':
+                end = term.find('}', i)
+                i = len(term) if end == -1 else end + 1
+                literals.append(run)
+                run = ""
+                continue
+            elif c in '\\.^$*+?}':
+                literals.append(run)
+                run = ""
+                i += 2 if c == '\\' else 1
+                continue
+            else:
+                char, i = c, i + 1
+            if i < len(term) and term[i] in '?*{':
+                # An optional character ends the run without being part of it.
+                literals.append(run)
+                run = ""
+            elif i < len(term) and term[i] == '+':
+                literals.append(run + char)
+                run = ""
+            else:
+                run += char
+        literals.append(run)
+        return [literal.lower() for literal in literals if len(literal) >= 3]
+
+    def _sort_new_rows(self):
+        """Brings the sorted name array up to date. Rows appended by extend() are sorted on their own, then merged in."""
+        added = sorted(range(len(self.sorted_rows), len(self.names)), key=self.names.__getitem__)
+        # Two sorted runs: Timsort merges them in linear time.
+        order = sorted(list(self.sorted_rows) + added, key=self.names.__getitem__) if self.sorted_rows else added
+        self.sorted_names = [self.names[row] for row in order]
+        self.sorted_rows = array('I', order)
+
+    def _prefix_rows(self, term):
+        if len(self.sorted_rows) != len(self.names):
+            self._sort_new_rows()
+        start = bisect.bisect_left(self.sorted_names, term)
+        end = bisect.bisect_left(self.sorted_names, term + '\U0010ffff', start) # Past every name starting with term
+        return sorted(self.sorted_rows[start:end])
+
+    def _candidates(self, literals):
+        """Rows containing every trigram of the given literals, ascending. All rows if nothing can narrow it."""
+        if self.postings is None:
+            return range(len(self.names))
+        grams = {literal[i:i + 3] for literal in literals for i in range(len(literal) - 2)}
+        if not grams:
+            return range(len(self.names))
+        lists = []
+        for gram in grams:
+            rows = self.postings.get(gram)
+            if rows is None:
+                return []
+            lists.append(rows)
+        lists.sort(key=len)
+        if len(lists) == 1 or len(lists[0]) * 8 > len(self.names):
+            # Intersecting broad postings costs more than verifying the rows the caller actually returns.
+            return lists[0]
+        candidates = set(lists[0])
+        # The rarest few trigrams narrow enough; the caller verifies the rest.
+        for rows in lists[1:4]:
+            candidates.intersection_update(rows)
+            if not candidates:
+                return []
+        return sorted(candidates)
+
+class TextureQuery:
+    """
+    Multi-attribute gallery filter such as 'name:*button* w>=512 fmt:DXT5 size>200KB'.
+    Terms are ANDed and a leading '-' negates one. Fields: name (any Filename search form), w, h,
+    frames and index with : = != < <= > >=, dim:WxH, fmt (comma separated, globs allowed) and
+    size / unpacked with an optional B, KB, MB or GB suffix. A bare word is a name term.
+    Each term is parsed into a row filter over the table's columns; filters run in turn, each
+    one a single comprehension over the rows the previous ones kept.
+    """
+    _TERM = re.compile(r'^(-?)([A-Za-z_]+)(:|==|!=|<=|>=|<|>|=)(.*)$')
+    _SIZE = re.compile(r'^(\d+(?:\.\d+)?)\s*(b|k|kb|m|mb|g|gb)?$', re.IGNORECASE)
+    _UNITS = {'b': 1, 'k': 1024, 'kb': 1024, 'm': 1024 ** 2, 'mb': 1024 ** 2, 'g': 1024 ** 3, 'gb': 1024 ** 3}
+    # query field -> (kind, TextureTable column)
+    _FIELDS = {
+        'name': ('name', None), 'file': ('name', None), 'filename': ('name', None),
+        'w': ('int', '_widths'), 'width': ('int', '_widths'), 'h': ('int', '_heights'), 'height': ('int', '_heights'),
+        'frames': ('int', '_frames'), 'index': ('index', None), 'idx': ('index', None),
+        'dim': ('dim', None), 'dims': ('dim', None), 'dimensions': ('dim', None),
+        'fmt': ('format', None), 'format': ('format', None),
+        'size': ('size', '_sizes'), 'packed': ('size', '_sizes'), 'unpacked': ('size', '_unpacked_sizes'),
+    }
+    _OPERATORS = {':': operator.eq, '=': operator.eq, '==': operator.eq, '!=': operator.ne,
+                  '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge}
+
+    def __init__(self, query):
+        self.query = query
+        self.name_terms = [] # (negated, search box query)
+        self.format_terms = [] # (negated, [lowercase names or globs])
+        self._filters = [] # (table, rows) -> kept rows, ascending
+        for token in re.findall(r'(?:"[^"]*"|\S)+', query):
+            self._add_term(token)
+        if not self.name_terms and not self.format_terms and not self._filters:
+            raise ValueError("Empty query")
+
+    def _add_term(self, token):
+        match = self._TERM.match(token)
+        field = self._FIELDS.get(match.group(2).lower()) if match else None
+        if field is None:
+            negated = token.startswith('-') and len(token) > 1
+            self.name_terms.append((negated, (token[1:] if negated else token).strip('"')))
+            return
+        negated, compare, value = bool(match.group(1)), self._OPERATORS[match.group(3)], match.group(4).strip('"')
+        kind, column = field
+        if not value:
+            raise ValueError("Missing value for '{}'".format(match.group(2)))
+        if kind in ('name', 'dim', 'format') and compare not in (operator.eq, operator.ne):
+            raise ValueError("'{}' only supports ':' and '!='".format(match.group(2)))
+        negated ^= compare is operator.ne
+        if compare is operator.ne:
+            compare = operator.eq
+        if kind == 'name':
+            self.name_terms.append((negated, value))
+            return
+        if kind == 'format':
+            self.format_terms.append((negated, [name.lower() for name in value.split(',') if name]))
+            return
+        if kind == 'dim':
+            width, height = parse_dimensions(value)
+            if not (width and height):
+                raise ValueError("Dimensions must look like 256x256")
+            def dimensions_filter(table, rows):
+                widths, heights = table._widths, table._heights
+                return [i for i in rows if (widths[i] == width and heights[i] == height) != negated]
+            self._filters.append(dimensions_filter)
+            return
+        if kind == 'size':
+            size = self._SIZE.match(value)
+            if size is None:
+                raise ValueError("Invalid size '{}'".format(value))
+            number = int(float(size.group(1)) * self._UNITS[(size.group(2) or 'b').lower()])
+        else:
+            try:
+                number = int(value)
+            except ValueError:
+                raise ValueError("Invalid number '{}'".format(value)) from None
+        if kind == 'index':
+            number -= 1 # The gallery shows 1-based positions.
+            def index_filter(table, rows):
+                return [i for i in rows if compare(i, number) != negated]
+            self._filters.append(index_filter)
+        else:
+            def column_filter(table, rows):
+                values = getattr(table, column)
+                return [i for i in rows if compare(values[i], number) != negated]
+            self._filters.append(column_filter)
+
+    def _format_ids(self, table, patterns):
+        ids = set()
+        for format_id, format_name in enumerate(table._format_names):
+            name = format_name.lower()
+            base = name.split(' (')[0]
+            if any(name == p or base == p or fnmatch.fnmatchcase(name, p) for p in patterns):
+                ids.add(format_id)
+        return ids
+
+    def filter(self, table, search_index=None):
+        """Returns the matching rows of a TextureTable in ascending order. Name terms use search_index when given."""
+        if search_index is None:
+            search_index = TextureSearchIndex(table.names(), build_postings=False)
+        rows = None
+        excluded = set()
+        for negated, query in self.name_terms:
+            matches = search_index.search(query)
+            if negated:
+                excluded.update(matches)
+            elif rows is None:
+                rows = matches
+            else:
+                wanted = set(matches)
+                rows = [row for row in rows if row in wanted]
+        rows = list(range(len(table))) if rows is None else rows
+        if excluded:
+            rows = [row for row in rows if row not in excluded]
+        formats = table._formats
+        for negated, patterns in self.format_terms:
+            ids = self._format_ids(table, patterns)
+            rows = [row for row in rows if (formats[row] in ids) != negated]
+        for row_filter in self._filters:
+            rows = row_filter(table, rows)
+        return rows
+
+class TextureMetadataIndex:
+    """
+    Persistent SQLite cache of Get Info results, stored next to config.ini.
+    Entries are keyed by file size, mtime and the XBT directory digest, and the
+    least recently used ones are evicted once the cache grows past max_bytes.
+    Facet counts are stored alongside the records, and grid thumbnails are stored per entry
+    and capped separately by max_thumbnail_bytes. Thumbnail sizes are kept in their own indexed
+    column and a running total, so writes only aggregate over the table once the cap is crossed.
+    Every call opens its own short-lived connection, so it is safe to use from worker threads.
+    """
+    SCHEMA_VERSION = 6 # 5: 64-bit size columns in the stored TextureTable, 6: thumbnails.png_size
+
+    def __init__(self, db_path, max_bytes=64 * 1024 * 1024, max_thumbnail_bytes=256 * 1024 * 1024):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.max_thumbnail_bytes = max_thumbnail_bytes
+        self.init_error = None # Set when the database could not be opened; the app logs it once the log exists
+        self._thumbnail_bytes = None # Running total of thumbnails.png_size, an upper bound; read on first write
+        self._thumbnail_lock = threading.Lock()
+        try:
+            with self._connect() as conn:
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                if version != self.SCHEMA_VERSION:
+                    # It's only a cache: drop anything written by another schema.
+                    conn.execute("DROP TABLE IF EXISTS entries")
+                    conn.execute("DROP TABLE IF EXISTS thumbnails")
+                    conn.execute("PRAGMA user_version = {}".format(self.SCHEMA_VERSION))
+                conn.execute("""CREATE TABLE IF NOT EXISTS entries (
+                    entry_key TEXT PRIMARY KEY,
+                    source_path TEXT,
+                    texture_count INTEGER,
+                    records BLOB,
+                    facets TEXT,
+                    blob_size INTEGER,
+                    last_access REAL)""")
+                conn.execute("""CREATE TABLE IF NOT EXISTS thumbnails (
+                    entry_key TEXT,
+                    texture_index INTEGER,
+                    png_size INTEGER,
+                    png BLOB,
+                    PRIMARY KEY (entry_key, texture_index))""")
+                conn.execute("CREATE INDEX IF NOT EXISTS thumbnail_sizes ON thumbnails (entry_key, png_size)")
+        except sqlite3.Error as e:
+            self.init_error = str(e)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # sqlite3's own context manager only commits; the connection must also be closed so the file isn't held open.
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(xbt_path, digest):
+        st = os.stat(xbt_path)
+        return "{}:{}:{}".format(st.st_size, st.st_mtime_ns, digest)
+
+    def lookup(self, entry_key, cache_dir=None):
+        """Returns the stored TextureTable (paths derived from cache_dir, facets preloaded) or None. Marks the entry as recently used."""
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT records, facets FROM entries WHERE entry_key = ?", (entry_key,)).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE entries SET last_access = ? WHERE entry_key = ?", (datetime.now().timestamp(), entry_key))
+            table = TextureTable.from_bytes(row[0], cache_dir)
+            if row[1]:
+                table._facets = json.loads(row[1])
+            return table
+        except (sqlite3.Error, zlib.error, struct.error, ValueError, KeyError):
+            return None
+
+    def store(self, entry_key, source_path, records):
+        """Stores a TextureTable and its facet counts (cache paths are dropped, they are rebuilt per session) and enforces the size cap."""
+        blob = records.to_bytes()
+        facets = json.dumps(records.facets())
+        try:
+            with self._connect() as conn:
+                conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             (entry_key, source_path, len(records), blob, facets, len(blob) + len(facets), datetime.now().timestamp()))
+                self._evict_entries(conn)
+            return True
+        except sqlite3.Error:
+            return False
+
+    def load_thumbnail(self, entry_key, texture_index):
+        """Returns the stored PNG bytes of a grid thumbnail, or None."""
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT png FROM thumbnails WHERE entry_key = ? AND texture_index = ?",
+                                   (entry_key, texture_index)).fetchone()
+            return row[0] if row else None
+        except sqlite3.Error:
+            return None
+
+    def store_thumbnails(self, items):
+        """
+        Stores (entry_key, texture_index, png_bytes) tuples in one transaction. Runs off the GUI thread;
+        the thumbnail cap is only enforced, with a scan of the size index, once the running total crosses it.
+        """
+        with self._thumbnail_lock:
+            try:
+                with self._connect() as conn:
+                    if self._thumbnail_bytes is None:
+                        self._thumbnail_bytes = conn.execute("SELECT COALESCE(SUM(png_size), 0) FROM thumbnails").fetchone()[0]
+                    conn.executemany("INSERT OR REPLACE INTO thumbnails VALUES (?, ?, ?, ?)",
+                                     ((entry_key, texture_index, len(png), png) for entry_key, texture_index, png in items))
+                    # Replaced rows are counted twice, so the total errs high and is corrected when it is checked.
+                    self._thumbnail_bytes += sum(len(png) for _, _, png in items)
+                    if self._thumbnail_bytes > self.max_thumbnail_bytes:
+                        self._evict_thumbnails(conn)
+                return True
+            except sqlite3.Error:
+                self._thumbnail_bytes = None
+                return False
+
+    def _evict_entries(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(blob_size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for entry_key, blob_size in conn.execute("SELECT entry_key, blob_size FROM entries ORDER BY last_access ASC").fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM entries WHERE entry_key = ?", (entry_key,))
+            # The running thumbnail total now errs high; the next check past the cap corrects it.
+            conn.execute("DELETE FROM thumbnails WHERE entry_key = ?", (entry_key,))
+            total -= blob_size
+
+    def _evict_thumbnails(self, conn):
+        # Thumbnail sets of evicted entries go first, then whole sets, least recently used archive first.
+        sets = conn.execute("""SELECT t.entry_key, SUM(t.png_size), COALESCE(MAX(e.last_access), -1) FROM thumbnails t
+                               LEFT JOIN entries e ON e.entry_key = t.entry_key
+                               GROUP BY t.entry_key ORDER BY 3 ASC""").fetchall()
+        total = sum(set_size for _, set_size, _ in sets)
+        for entry_key, set_size, last_access in sets:
+            if total <= self.max_thumbnail_bytes and last_access >= 0:
+                break
+            conn.execute("DELETE FROM thumbnails WHERE entry_key = ?", (entry_key,))
+            total -= set_size
+        self._thumbnail_bytes = total
+
+class InfoRecordBatch:
+    """Parsed '-info' output handed from a Worker to the GUI in one signal: new records, their raw lines and the latest progress."""
+    __slots__ = ('records', 'lines', 'progress', 'message')
+
+    def __init__(self, cache_dir):
+        self.records = TextureTable(cache_dir)
+        self.lines = []
+        self.progress = -1 # -1 when the progress did not change
+        self.message = ""
+
+    def __bool__(self):
+        return bool(len(self.records) or self.lines or self.progress >= 0)
+
 class Worker(QObject):
     finished = Signal(int, str)
     error = Signal(str)
     progress_updated = Signal(int, str)  # Emits progress percentage and message
-    info_line_parsed = Signal(str, str)  # Emits formatted HTML and the raw filename
+    info_batch_ready = Signal(object)  # Emits an InfoRecordBatch of parsed '-info' records, raw lines and progress
+    info_sizes_scanned = Signal(object)  # Emits array('I') of cached PNG sizes, in the order the records were emitted
+
+    # '-info' records are flushed to the GUI every INFO_FLUSH_INTERVAL seconds or INFO_FLUSH_RECORDS records.
+    INFO_FLUSH_INTERVAL = 0.016
+    INFO_FLUSH_RECORDS = 1000
 
     class StreamReader(QObject):
         lines_ready = Signal(list)
         finished = Signal()
+        MAX_BATCH_LINES = 1000
+        FLUSH_INTERVAL = 0.016
 
         def __init__(self, stream):
             super().__init__()
@@ -94,27 +1904,36 @@ class Worker(QObject):
 
             # Batching logic to prevent signal flooding on large file outputs
             batch = []
+            last_emit = time.monotonic()
             # iter(readline, '') blocks until a line is read or EOF is reached.
             for line in iter(self.stream.readline, ''):
                 clean_line = line.strip()
                 if clean_line:
                     batch.append(clean_line)
 
-                # Emit batch if size threshold reached (e.g., 25 lines)
-                if len(batch) >= 25:
+                # Emit by size or age: fast output goes out in large batches, slow output stays responsive.
+                if len(batch) >= self.MAX_BATCH_LINES or (batch and time.monotonic() - last_emit >= self.FLUSH_INTERVAL):
                     self.lines_ready.emit(batch)
                     batch = []
+                    last_emit = time.monotonic()
 
             # Flush any remaining lines
             if batch:
                 self.lines_ready.emit(batch)
             self.finished.emit()
 
-    def __init__(self, command, cwd, show_window: bool = False):
+    def __init__(self, command, cwd, show_window: bool = False, info_cache_dir=None):
         super().__init__()
         self.command = command
         self.cwd = cwd
         self.show_window = show_window
+        # When set, '-info' output is parsed into TextureTable records here, off the GUI thread.
+        self.info_cache_dir = info_cache_dir
+        self.info_record = None # [filename, dimensions, format] of the texture still receiving detail lines
+        self.info_names = []
+        self.info_batch = None
+        self.info_flush_scheduled = False
+        self.last_info_flush = time.monotonic()
         self.process = None
         self.reader_thread = None
         self.stdout_reader = None
@@ -194,7 +2013,13 @@ class Worker(QObject):
             self._emit_error(f"Failed to start process: {e}")
 
     def _on_stdout_batch(self, lines):
-        # Process a batch of lines to prevent signal flooding
+        # Process a batch of lines to prevent signal flooding. '-info' output is parsed into the
+        # pending InfoRecordBatch, which also carries progress, so it costs one signal per flush.
+        batch = None
+        if self.info_cache_dir is not None:
+            if self.info_batch is None:
+                self.info_batch = InfoRecordBatch(self.info_cache_dir)
+            batch = self.info_batch
         for line in lines:
             if line.startswith("PROGRESS:"):
                 try:
@@ -206,23 +2031,59 @@ class Worker(QObject):
                     # Only emit the signal if the percentage has actually changed.
                     if percentage > self.last_emitted_progress:
                         self.last_emitted_progress = percentage
-                        self.progress_updated.emit(percentage, message)
+                        if batch is None:
+                            self.progress_updated.emit(percentage, message)
+                        else:
+                            batch.progress, batch.message = percentage, message
 
                 except (ValueError, IndexError):
                     pass
+            elif batch is None:
+                continue
             elif line.startswith("Texture:"):
                 try:
                     details_part = line.split("Texture:", 1)[1].strip()
                     png_index = details_part.rfind('.png')
                     if png_index != -1:
-                        filename = details_part[:png_index + 4]
-                        self.info_line_parsed.emit(line.strip(), filename)
+                        # A 'Texture:' line starts a new record; the previous one is complete.
+                        self._complete_info_record(batch.records)
+                        self.info_record = [details_part[:png_index + 4], 'N/A', 'N/A']
+                        batch.lines.append(line.strip())
                 except IndexError:
                     pass
             else: # For all other lines like "Dimensions", "Format", etc.
                 clean_line = line.strip()
                 if clean_line:
-                    self.info_line_parsed.emit(clean_line, "") # Emit with no filename
+                    batch.lines.append(clean_line)
+                    if self.info_record is not None:
+                        if "Dimensions:" in clean_line:
+                            self.info_record[1] = clean_line.split("Dimensions:", 1)[1].strip()
+                        elif "Format:" in clean_line:
+                            self.info_record[2] = clean_line.split("Format:", 1)[1].strip()
+        if batch is not None:
+            self._schedule_info_flush()
+
+    def _schedule_info_flush(self):
+        # Flush when the batch is big or old enough; otherwise a short timer sends whatever is pending.
+        if len(self.info_batch.records) >= self.INFO_FLUSH_RECORDS or time.monotonic() - self.last_info_flush >= self.INFO_FLUSH_INTERVAL:
+            self._flush_info_batch()
+        elif not self.info_flush_scheduled:
+            self.info_flush_scheduled = True
+            QTimer.singleShot(int(self.INFO_FLUSH_INTERVAL * 1000), self._flush_info_batch)
+
+    def _flush_info_batch(self):
+        self.info_flush_scheduled = False
+        batch, self.info_batch = self.info_batch, None
+        if batch:
+            self.last_info_flush = time.monotonic()
+            self.info_batch_ready.emit(batch)
+
+    def _complete_info_record(self, records):
+        if self.info_record is not None:
+            filename, dimensions, format_name = self.info_record
+            records.append({'filename': filename, 'dimensions': dimensions, 'format': format_name})
+            self.info_names.append(filename)
+            self.info_record = None
 
     def _on_stderr_batch(self, lines):
         self.full_stderr.extend(lines)
@@ -231,6 +2092,12 @@ class Worker(QObject):
         sender = self.sender()
         if sender == self.stdout_reader:
             self.stdout_finished = True
+            if self.info_cache_dir is not None:
+                if self.info_record is not None:
+                    if self.info_batch is None:
+                        self.info_batch = InfoRecordBatch(self.info_cache_dir)
+                    self._complete_info_record(self.info_batch.records)
+                self._flush_info_batch()
         elif sender == self.stderr_reader:
             self.stderr_finished = True
 
@@ -255,6 +2122,15 @@ class Worker(QObject):
         # This prevents the entire log from being re-processed at the end.
         stderr_str = "\n".join(self.full_stderr)
 
+        if self.info_cache_dir is not None and self.info_names:
+            # The PNGs are complete now: size them all with one directory scan instead of a stat per record.
+            file_sizes = scan_file_sizes(self.info_cache_dir)
+            sizes = array('Q')
+            for filename in self.info_names:
+                relative = os.path.relpath(xbt_record_cache_path(self.info_cache_dir, filename), self.info_cache_dir)
+                sizes.append(file_sizes.get(os.path.normcase(relative), 0))
+            self.info_sizes_scanned.emit(sizes)
+
         if self.process.returncode == 0:
             self.finished.emit(self.process.returncode, stderr_str) # Pass empty string for stdout
         else:
@@ -266,6 +2142,659 @@ class Worker(QObject):
         error_msg = f"An unexpected fatal error occurred in the worker thread: {message}\n\nTraceback:\n{tb_str}"
         self.error.emit(error_msg)
 
+class XbtInfoWorker(QObject):
+    """Reads an XBT directory once, in-process, and builds the previewer records. Nothing is extracted."""
+    finished = Signal(object, object, bool, str)  # Emits the open XbtReader, the TextureTable, whether it came from the metadata index and the index key
+    error = Signal(str)
+    progress_updated = Signal(int, str)
+    records_streamed = Signal(object, object)  # Emits the open XbtReader and a TextureTable of new rows while the directory is read
+    STREAM_BATCH_ROWS = 1000
+
+    def __init__(self, xbt_path, cache_dir, metadata_index=None):
+        super().__init__()
+        self.xbt_path = xbt_path
+        self.cache_dir = cache_dir
+        self.metadata_index = metadata_index
+
+    def run(self):
+        try:
+            reader = XbtReader(self.xbt_path)
+        except XbtFormatError as e:
+            self.error.emit(str(e))
+            return
+        except Exception as e:
+            self.error.emit("Unexpected error reading XBT directory: {}".format(e))
+            return
+
+        try:
+            entry_key = None
+            if self.metadata_index is not None:
+                entry_key = TextureMetadataIndex.make_key(self.xbt_path, reader.directory_digest())
+                cached = self.metadata_index.lookup(entry_key, self.cache_dir)
+                if cached is not None and len(cached) == len(reader):
+                    self.progress_updated.emit(100, "Loaded from metadata index")
+                    self.finished.emit(reader, cached, True, entry_key)
+                    return
+
+            records = TextureTable(self.cache_dir)
+            batch = TextureTable(self.cache_dir)
+            total = len(reader)
+            last_percentage = -1
+            for i, texture in enumerate(reader):
+                first = texture.frames[0] if texture.frames else None
+                if first:
+                    batch.add(texture.path, first.width, first.height, first.format_name, texture.packed_size,
+                              texture.unpacked_size, len(texture.frames), i, first.offset)
+                else:
+                    batch.add(texture.path)
+                if len(batch) >= self.STREAM_BATCH_ROWS:
+                    # Each batch is handed over whole; the GUI appends it to its own table.
+                    records.extend_table(batch)
+                    self.records_streamed.emit(reader, batch)
+                    batch = TextureTable(self.cache_dir)
+                percentage = int(((i + 1) / total) * 100)
+                if percentage > last_percentage:
+                    last_percentage = percentage
+                    self.progress_updated.emit(percentage, texture.path)
+            if len(batch):
+                records.extend_table(batch)
+                self.records_streamed.emit(reader, batch)
+            records.facets() # Counted here, off the GUI thread; stored with the records below
+            if entry_key is not None:
+                self.metadata_index.store(entry_key, self.xbt_path, records)
+            self.finished.emit(reader, records, False, entry_key or "")
+        except Exception as e:
+            reader.close()
+            self.error.emit("Unexpected error building texture records: {}".format(e))
+
+class XbtExtractWorker(QObject):
+    """
+    Native decompile. Splits the XBT frame directory into contiguous chunks of similar unpacked size
+    and fans them out over a process pool, so extraction scales with the available cores.
+    With a selection (see select_xbt_textures) only the chosen textures are read, decoded and written;
+    small jobs skip the pool and run on this thread, so pulling a few icons out takes milliseconds.
+    """
+    finished = Signal(int, str)
+    error = Signal(str)
+    progress_updated = Signal(int, str)
+    CHUNKS_PER_WORKER = 4 # More chunks than processes keeps every core busy and progress smooth
+    IN_THREAD_FRAME_LIMIT = 64 # Below this, process start-up costs more than the decoding itself
+
+    def __init__(self, xbt_path, output_dir, max_workers=0, selection=None):
+        super().__init__()
+        self.xbt_path = xbt_path
+        self.output_dir = output_dir
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.selection = selection
+
+    def _chunks(self, textures):
+        entries = [(texture.path, [(f.width, f.height, f.format, f.packed_size, f.unpacked_size, f.offset) for f in texture.frames])
+                   for texture in textures]
+        total_bytes = sum(texture.unpacked_size for texture in textures) or 1
+        target = total_bytes / (self.max_workers * self.CHUNKS_PER_WORKER)
+        chunks, chunk, chunk_bytes = [], [], 0
+        for entry, texture in zip(entries, textures):
+            chunk.append(entry)
+            chunk_bytes += texture.unpacked_size
+            if chunk_bytes >= target:
+                chunks.append(chunk)
+                chunk, chunk_bytes = [], 0
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    def run(self):
+        try:
+            with XbtReader(self.xbt_path) as reader:
+                if self.selection is None:
+                    textures = reader.textures
+                else:
+                    textures = [reader[i] for i in select_xbt_textures(reader, self.selection)]
+                chunks = self._chunks(textures)
+        except XbtFormatError as e:
+            self.error.emit(str(e))
+            return
+
+        if not chunks:
+            self.finished.emit(1, "No textures matched the selection.")
+            return
+
+        total_frames = sum(len(frames) for chunk in chunks for _, frames in chunk) or 1
+        done_frames, errors = 0, []
+        try:
+            if total_frames <= self.IN_THREAD_FRAME_LIMIT:
+                entries = [entry for chunk in chunks for entry in chunk]
+                written, errors = extract_xbt_chunk(self.xbt_path, self.output_dir, entries)
+                self.progress_updated.emit(100, "Extracted {}".format(entries[-1][0]))
+            else:
+                with ProcessPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as pool:
+                    futures = {pool.submit(extract_xbt_chunk, self.xbt_path, self.output_dir, chunk): chunk for chunk in chunks}
+                    for future in as_completed(futures):
+                        chunk = futures[future]
+                        written, chunk_errors = future.result()
+                        errors.extend(chunk_errors)
+                        done_frames += sum(len(frames) for _, frames in chunk)
+                        self.progress_updated.emit(int(done_frames * 100 / total_frames), "Extracted {}".format(chunk[-1][0]))
+        except Exception as e:
+            self.finished.emit(1, "Extraction failed: {}".format(e))
+            return
+
+        if errors:
+            details = "\n".join("{}: {}".format(name, message) for name, message in errors[:20])
+            more = "\n... and {} more".format(len(errors) - 20) if len(errors) > 20 else ""
+            self.finished.emit(1, "{} frame(s) could not be extracted:\n{}{}".format(len(errors), details, more))
+        else:
+            self.finished.emit(0, "")
+
+class XbtCompileWorker(QObject):
+    """
+    Native compile. Decodes and LZO-packs the source images in chunks on a process pool and streams the
+    packed frames into an XbtWriter in directory order, so the output matches TextureCompiler's.
+    In incremental mode, sources the manifest shows unchanged (same size and mtime, or else the same
+    content hash) have their packed frames copied straight across from the previous output.
+    With dupecheck, textures whose decoded pixels hash alike are stored once and aliased in the directory.
+    Before packing, the scan is diffed against the manifest and summarized through scan_summary; progress
+    is weighted by the pixels each image has to encode, from header-read dimensions.
+    error is only emitted when the compile cannot be attempted natively, so the caller can fall back.
+    """
+    finished = Signal(int, str)
+    error = Signal(str)
+    progress_updated = Signal(int, str)
+    scan_summary = Signal(str)
+    REUSE_WEIGHT = 1024 # Progress weight of a copied texture, in pixels; encoding costs one per pixel
+    CHUNK_FILES = 16
+    CHUNKS_IN_FLIGHT_PER_WORKER = 2 # Bounds the packed chunks held in memory while waiting for an earlier one
+    REPORTED_DUPLICATE_GROUPS = 20
+
+    def __init__(self, input_dir, output_path, max_workers=0, incremental=False, dupecheck=False):
+        super().__init__()
+        self.input_dir = input_dir
+        self.output_path = output_path
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.incremental = incremental
+        self.dupecheck = dupecheck
+        self.first_by_pixels = {} # pixel_digest -> texture number of the first texture with those pixels
+        self.duplicate_groups = {} # pixel_digest -> [texture names], first entry is the stored one
+        self.bytes_saved = 0
+
+    def _previous_output(self, manifest):
+        """Returns ({texture_name: XbtTexture}, reader) of the output being replaced, if its frames can be reused."""
+        if not (self.incremental and manifest):
+            return {}, None
+        try:
+            reader = XbtReader(self.output_path)
+        except XbtFormatError:
+            return {}, None
+        return {texture.path: texture for texture in reader}, reader
+
+    def _preflight(self, sources, manifest, scan_seconds):
+        """Header-probes new and changed images and reports what the build will pack. Returns {texture_name: (width, height, format)}."""
+        added, changed, unchanged, removed = diff_compile_sources(sources, manifest)
+        headers = {source[0]: manifest[source[0]][4:7] for source in unchanged}
+        to_probe = added + changed
+        headers.update(zip((source[0] for source in to_probe), probe_image_headers([source[1] for source in to_probe])))
+
+        formats = Counter(fmt or "unreadable" for _, _, fmt in headers.values())
+        pixel_bytes = sum(width * height * 4 for width, height, _ in headers.values())
+        lines = ["Scanned {} images in {:.2f}s: {} new, {} changed, {} removed, {} unchanged since the last build.".format(
+            len(sources), scan_seconds, len(added), len(changed), len(removed), len(unchanged))]
+        lines.append("About {:,} bytes of pixels to pack; {}.".format(
+            pixel_bytes, ", ".join("{} {}".format(count, fmt) for fmt, count in formats.most_common())))
+        self.scan_summary.emit("\n".join(lines))
+        return headers
+
+    def _add(self, writer, texture_name, pixel_digest, frames=None, payloads=None, texture=None):
+        """Adds an encoded texture, or the previous build's texture when given, unless dupecheck finds it is an alias."""
+        if self.dupecheck and pixel_digest is not None:
+            original = self.first_by_pixels.get(pixel_digest)
+            if original is not None:
+                writer.add_alias(texture_name, original, texture.loop if texture is not None else 0)
+                self.bytes_saved += sum(entry[3] for entry in writer.textures[original][2])
+                self.duplicate_groups[pixel_digest].append(texture_name)
+                return
+            self.first_by_pixels[pixel_digest] = len(writer.textures)
+            self.duplicate_groups[pixel_digest] = [texture_name]
+        if texture is not None:
+            # Payload views are only referenced from this frame, so the old mapping can be closed afterwards.
+            writer.add_texture(texture_name, [(f.width, f.height, f.format, f.packed_size, f.unpacked_size, f.duration) for f in texture.frames],
+                               [f.payload for f in texture.frames], texture.loop)
+        else:
+            writer.add_texture(texture_name, frames, payloads)
+
+    def _dupecheck_report(self, hash_seconds):
+        groups = [names for names in self.duplicate_groups.values() if len(names) > 1]
+        if not groups:
+            return "Dupecheck: no duplicate textures (pixel hashing took {:.2f}s across workers).".format(hash_seconds)
+        groups.sort(key=len, reverse=True)
+        lines = ["Dupecheck: {} duplicate texture(s) in {} group(s), {:,} bytes saved (pixel hashing took {:.2f}s across workers).".format(
+            sum(len(names) - 1 for names in groups), len(groups), self.bytes_saved, hash_seconds)]
+        for names in groups[:self.REPORTED_DUPLICATE_GROUPS]:
+            lines.append("  {} <- {}".format(names[0], ", ".join(names[1:])))
+        if len(groups) > self.REPORTED_DUPLICATE_GROUPS:
+            lines.append("  ... and {} more group(s)".format(len(groups) - self.REPORTED_DUPLICATE_GROUPS))
+        return "\n".join(lines)
+
+    def run(self):
+        if _lzo_backend is None:
+            self.error.emit("python-lzo is not installed.")
+            return
+        started = time.perf_counter()
+        try:
+            sources = scan_xbt_sources(self.input_dir)
+        except OSError as e:
+            self.error.emit("Could not read the input folder: {}".format(e))
+            return
+        if not sources:
+            self.finished.emit(1, "No PNG, JPG or GIF images found in {}".format(self.input_dir))
+            return
+
+        manifest = load_xbt_compile_manifest(self.output_path)
+        headers = self._preflight(sources, manifest, time.perf_counter() - started)
+        previous, reader = self._previous_output(manifest)
+        # Per source, the manifest entry to reuse it under, or None when it has to go through the pool.
+        reuse_entries, to_encode, weights = [], [], []
+        for texture_name, path, size, mtime_ns in sources:
+            known = manifest.get(texture_name) if texture_name in previous else None
+            if known is not None and known[:2] == (size, mtime_ns):
+                reuse_entries.append(known)
+                weights.append(self.REUSE_WEIGHT)
+            else:
+                reuse_entries.append(None)
+                to_encode.append((texture_name, path, known[2] if known is not None else None))
+                width, height, _ = headers[texture_name]
+                weights.append(max(width * height, self.REUSE_WEIGHT))
+        chunks = [to_encode[i:i + self.CHUNK_FILES] for i in range(0, len(to_encode), self.CHUNK_FILES)]
+
+        done_weight, total_weight = 0, sum(weights)
+        reused, errors, files = 0, [], {}
+        hash_seconds = 0.0
+        last_percentage = -1
+        try:
+            with XbtWriter(self.output_path) as writer, \
+                    ProcessPoolExecutor(max_workers=max(1, min(self.max_workers, len(chunks)))) as pool:
+                # Chunks are submitted ahead but consumed in order, since the payloads are laid out in directory order.
+                in_flight, results = deque(), deque()
+                next_chunk = 0
+                for (texture_name, path, size, mtime_ns), known, weight in zip(sources, reuse_entries, weights):
+                    while next_chunk < len(chunks) and len(in_flight) < self.max_workers * self.CHUNKS_IN_FLIGHT_PER_WORKER:
+                        in_flight.append(pool.submit(encode_xbt_source_chunk, chunks[next_chunk]))
+                        next_chunk += 1
+                    if known is None:
+                        if not results:
+                            results.extend(in_flight.popleft().result())
+                        _, frames, payloads, digest, pixel_digest, seconds, error = results.popleft()
+                        hash_seconds += seconds
+                        if error is not None:
+                            errors.append((texture_name, error))
+                        elif errors:
+                            pass # Nothing is written once an image has failed; keep collecting errors.
+                        elif frames is None:
+                            pixel_digest = manifest[texture_name][3]
+                            self._add(writer, texture_name, pixel_digest, texture=previous[texture_name])
+                            reused += 1
+                        else:
+                            self._add(writer, texture_name, pixel_digest, frames, payloads)
+                        frames = payloads = None
+                    else:
+                        digest, pixel_digest = known[2], known[3]
+                        if not errors:
+                            self._add(writer, texture_name, pixel_digest, texture=previous[texture_name])
+                            reused += 1
+                    files[texture_name] = (size, mtime_ns, digest, pixel_digest) + tuple(headers[texture_name])
+                    done_weight += weight
+                    percentage = int(done_weight * 100 / total_weight)
+                    if percentage > last_percentage:
+                        last_percentage = percentage
+                        self.progress_updated.emit(percentage, "Packed {}".format(texture_name))
+                if reader is not None:
+                    reader.close() # The old file is about to be replaced
+                if errors:
+                    writer.abort()
+                else:
+                    total_bytes = writer.finish()
+                    save_xbt_compile_manifest(self.output_path, files)
+        except Exception as e:
+            self.finished.emit(1, "Compile failed: {}".format(e))
+            return
+        finally:
+            if reader is not None:
+                reader.close()
+
+        if errors:
+            details = "\n".join("{}: {}".format(name, message) for name, message in errors[:20])
+            more = "\n... and {} more".format(len(errors) - 20) if len(errors) > 20 else ""
+            self.finished.emit(1, "{} image(s) could not be read, nothing was written:\n{}{}".format(len(errors), details, more))
+            return
+        if reused:
+            summary = "Packed {} textures ({} unchanged, copied from the previous build) into {:,} bytes.".format(
+                len(sources), reused, total_bytes)
+        else:
+            summary = "Packed {} textures into {:,} bytes.".format(len(sources), total_bytes)
+        if self.dupecheck:
+            summary += "\n" + self._dupecheck_report(hash_seconds)
+        self.finished.emit(0, summary)
+
+class NearDuplicateWorker(QObject):
+    """
+    Perceptual near-duplicate report. Hashes every texture of an XBT file (items from Get Info) or every
+    source image of a compile folder on a process pool, clusters the hashes with near_duplicate_clusters
+    and emits a plain-text report listing each cluster and the bytes dropping its copies would save.
+    """
+    finished = Signal(str)
+    error = Signal(str)
+    progress_updated = Signal(int, str)
+    CHUNK_ITEMS = 256
+    REPORTED_CLUSTERS = 25
+
+    def __init__(self, xbt_path=None, items=None, folder=None, max_workers=0):
+        super().__init__()
+        self.xbt_path = xbt_path
+        self.items = items or [] # (name, size in bytes, locator) as perceptual_hash_chunk takes them
+        self.folder = folder
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def run(self):
+        started = time.perf_counter()
+        items = self.items
+        if self.folder:
+            try:
+                items = [(name, size, path) for name, path, size, _ in scan_xbt_sources(self.folder)]
+            except OSError as e:
+                self.error.emit("Could not read {}: {}".format(self.folder, e))
+                return
+        if not items:
+            self.error.emit("There are no images to compare.")
+            return
+
+        starts = range(0, len(items), self.CHUNK_ITEMS)
+        hashes, unreadable, done = {}, 0, 0
+        try:
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(starts))) as pool:
+                futures = {pool.submit(perceptual_hash_chunk, self.xbt_path, [locator for _, _, locator in items[start:start + self.CHUNK_ITEMS]]): start
+                           for start in starts}
+                for future in as_completed(futures):
+                    start = futures[future]
+                    for offset, value in enumerate(future.result()):
+                        if value is None:
+                            unreadable += 1
+                        else:
+                            hashes[start + offset] = value
+                    done += self.CHUNK_ITEMS
+                    self.progress_updated.emit(min(99, done * 100 // len(items)), "Hashed {} images".format(min(done, len(items))))
+        except Exception as e:
+            self.error.emit("Hashing failed: {}".format(e))
+            return
+
+        clusters = []
+        for rows in near_duplicate_clusters(hashes):
+            rows.sort(key=lambda row: (-items[row][1], items[row][0]))
+            clusters.append((sum(items[row][1] for row in rows[1:]), rows))
+        clusters.sort(key=lambda cluster: cluster[0], reverse=True)
+        self.progress_updated.emit(100, "Clustered {} images".format(len(hashes)))
+
+        lines = ["Near-duplicate scan of {} images took {:.1f}s: {} cluster(s), {} redundant image(s), up to {:,} bytes to save.".format(
+            len(items), time.perf_counter() - started, len(clusters), sum(len(rows) - 1 for _, rows in clusters),
+            sum(saving for saving, _ in clusters))]
+        if unreadable:
+            lines.append("{} image(s) could not be read and were skipped.".format(unreadable))
+        for saving, rows in clusters[:self.REPORTED_CLUSTERS]:
+            lines.append("  {:,} bytes: {} ~ {}".format(saving, items[rows[0]][0], ", ".join(items[row][0] for row in rows[1:])))
+        if len(clusters) > self.REPORTED_CLUSTERS:
+            lines.append("  ... and {} more cluster(s)".format(len(clusters) - self.REPORTED_CLUSTERS))
+        self.finished.emit("\n".join(lines))
+
+def read_preview_image(path, max_dim=8192):
+    """
+    Reads an image file for the previewer, scaling anything larger than max_dim down.
+    Returns (QImage or None, source QSize or None, error reason).
+    """
+    reader = QImageReader(path)
+    reader.setAllocationLimit(0)
+    reader.setAutoTransform(True)
+    if not reader.canRead():
+        return None, None, reader.errorString()
+    size = reader.size()
+    if size.width() > max_dim or size.height() > max_dim:
+        reader.setScaledSize(size.scaled(max_dim, max_dim, Qt.AspectRatioMode.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        return None, size, reader.errorString()
+    return image, size, ""
+
+class DecodedImageCache:
+    """LRU cache of decoded preview images, keyed by (preview index, display width, display height) and bounded by a memory budget in bytes."""
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        image = self._entries.get(key)
+        if image is not None:
+            self._entries.move_to_end(key)
+        return image
+
+    def put(self, key, image):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.total_bytes -= old.sizeInBytes()
+        self._entries[key] = image
+        self.total_bytes += image.sizeInBytes()
+        # The newest entry is always kept, even if it alone is over budget, so it can still be shown.
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self.total_bytes -= evicted.sizeInBytes()
+
+    def clear(self):
+        self._entries.clear()
+        self.total_bytes = 0
+
+PREVIEW_THUMBNAIL_SIZE = 128
+
+def read_thumbnail_image(path, max_dim):
+    """Reads an image file scaled to fit max_dim. Lets the image plugin decode at reduced size where it can (e.g. JPEG)."""
+    reader = QImageReader(path)
+    reader.setAllocationLimit(0)
+    reader.setAutoTransform(True)
+    size = reader.size()
+    if size.isValid() and (size.width() > max_dim or size.height() > max_dim):
+        reader.setScaledSize(size.scaled(max_dim, max_dim, Qt.AspectRatioMode.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        raise OSError(reader.errorString())
+    return image
+
+def encode_png_bytes(image):
+    """Encodes a QImage as PNG and returns the bytes."""
+    buffer = QBuffer()
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(buffer.data())
+
+class FrameDecodeSignals(QObject):
+    """Signals for FrameDecodeTask; QRunnable is not a QObject and cannot declare its own."""
+    decoded = Signal(int, int, QImage, QImage, QSize, QSize)  # Emits the request ID, preview index, display image, thumbnail, source size and display size
+    failed = Signal(int, int, str)
+
+class FrameDecodeTask(QRunnable):
+    """
+    Decodes one previewer image on a QThreadPool thread: either the first frame of an XBT texture
+    (straight from the payload, no filesystem access) or an extracted image file. The image is
+    also fitted to display_size here, so the GUI thread only has to wrap the result in a pixmap.
+    """
+    def __init__(self, request_id, preview_index, frame=None, path=None, display_size=None):
+        super().__init__()
+        # The app keeps a reference while the task is queued so it can be cancelled with tryTake().
+        self.setAutoDelete(False)
+        self.request_id = request_id
+        self.preview_index = preview_index
+        self.frame = frame
+        self.path = path
+        self.display_size = QSize(display_size) if display_size is not None else QSize()
+        self.signals = FrameDecodeSignals()
+
+    def run(self):
+        try:
+            if self.frame is not None:
+                image = decode_xbt_frame_image(self.frame)
+                source_size = image.size()
+            else:
+                image, source_size, error_reason = read_preview_image(self.path)
+                if image is None:
+                    self.signals.failed.emit(self.request_id, self.preview_index, error_reason)
+                    return
+            if image.width() > PREVIEW_THUMBNAIL_SIZE or image.height() > PREVIEW_THUMBNAIL_SIZE:
+                thumbnail = image.scaled(PREVIEW_THUMBNAIL_SIZE, PREVIEW_THUMBNAIL_SIZE, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+            else:
+                thumbnail = image
+            width, height = self.display_size.width(), self.display_size.height()
+            if width > 0 and height > 0 and (image.width() > width or image.height() > height):
+                image = image.scaled(self.display_size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+            if image.format() not in (QImage.Format.Format_RGB32, QImage.Format.Format_ARGB32_Premultiplied):
+                # The formats QPixmap.fromImage takes without converting.
+                image = image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+        except Exception as e:
+            self.signals.failed.emit(self.request_id, self.preview_index, str(e))
+            return
+        self.signals.decoded.emit(self.request_id, self.preview_index, image, thumbnail, source_size, self.display_size)
+
+class ThumbnailSignals(QObject):
+    """Signals for ThumbnailTask."""
+    ready = Signal(int, int, QImage, object)  # Emits the request ID, row, thumbnail and freshly encoded PNG bytes (None if loaded from disk)
+    failed = Signal(int, int, str)
+
+class ThumbnailTask(QRunnable):
+    """
+    Builds one grid thumbnail on the thumbnail pool. Thumbnails stored in the metadata index are
+    reused; new ones are decoded at a reduced level and PNG encoded so the GUI can persist them.
+    """
+    def __init__(self, request_id, row, frame=None, path=None, metadata_index=None, entry_key="", texture_index=-1):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.request_id = request_id
+        self.row = row
+        self.frame = frame
+        self.path = path
+        self.metadata_index = metadata_index
+        self.entry_key = entry_key
+        self.texture_index = texture_index
+        self.signals = ThumbnailSignals()
+
+    def run(self):
+        try:
+            persistent = self.metadata_index is not None and self.entry_key and self.texture_index >= 0
+            if persistent:
+                png = self.metadata_index.load_thumbnail(self.entry_key, self.texture_index)
+                if png:
+                    image = QImage.fromData(png, "PNG")
+                    if not image.isNull():
+                        self.signals.ready.emit(self.request_id, self.row, image, None)
+                        return
+            if self.frame is not None:
+                image = decode_xbt_frame_thumbnail(self.frame, PREVIEW_THUMBNAIL_SIZE)
+            else:
+                image = read_thumbnail_image(self.path, PREVIEW_THUMBNAIL_SIZE)
+            if image.width() > PREVIEW_THUMBNAIL_SIZE or image.height() > PREVIEW_THUMBNAIL_SIZE:
+                image = image.scaled(PREVIEW_THUMBNAIL_SIZE, PREVIEW_THUMBNAIL_SIZE, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+            self.signals.ready.emit(self.request_id, self.row, image, encode_png_bytes(image) if persistent else None)
+        except Exception as e:
+            self.signals.failed.emit(self.request_id, self.row, str(e))
+
+class ThumbnailGridModel(QAbstractListModel):
+    """
+    List model for the thumbnail grid. Thumbnails are only requested (via thumbnail_requested) when the
+    view asks to paint a cell, so with uniform item sizes only visible cells are ever decoded.
+    """
+    thumbnail_requested = Signal(int)
+
+    def __init__(self, thumbnail_cache, parent=None):
+        super().__init__(parent)
+        self.records = []
+        self.thumbnail_cache = thumbnail_cache
+        self.failed_rows = set()
+        self._placeholder = None
+        self._row_count = 0 # Rows announced to the view; records may already hold more while Get Info streams
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._row_count
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self._row_count:
+            return None
+        row = index.row()
+        record = self.records[row]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return os.path.basename(record['filename'])
+        if role == Qt.ItemDataRole.DecorationRole:
+            thumbnail = self.thumbnail_cache.get(row)
+            if thumbnail is not None:
+                return thumbnail
+            if self._placeholder is None:
+                self._placeholder = qta.icon('fa5s.image', color='#4c566a').pixmap(QSize(48, 48))
+            if row not in self.failed_rows:
+                self.thumbnail_requested.emit(row)
+            return self._placeholder
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return "{}\n{} | {}".format(record['filename'], record.get('dimensions', 'N/A'), record.get('format', 'N/A'))
+        return None
+
+    def reset(self, records):
+        self.beginResetModel()
+        self.records = records
+        self._row_count = len(records)
+        self.failed_rows.clear()
+        self.endResetModel()
+
+    def append_rows(self, records):
+        """Adopts records, which extend the current ones, and inserts the new rows in one batch without a reset."""
+        self.records = records
+        count = len(records)
+        if count > self._row_count:
+            self.beginInsertRows(QModelIndex(), self._row_count, count - 1)
+            self._row_count = count
+            self.endInsertRows()
+
+    def thumbnail_ready(self, row):
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+class SearchIndexSignals(QObject):
+    built = Signal(int, object)  # Emits the gallery generation and the TextureSearchIndex
+
+class SearchIndexTask(QRunnable):
+    """Builds the trigram search index off the GUI thread once a gallery has loaded."""
+    def __init__(self, generation, names):
+        super().__init__()
+        self.generation = generation
+        self.names = names
+        self.signals = SearchIndexSignals()
+
+    def run(self):
+        self.signals.built.emit(self.generation, TextureSearchIndex(self.names))
+
+class ThumbnailWriteSignals(QObject):
+    finished = Signal()
+
+class ThumbnailWriteTask(QRunnable):
+    """Writes a batch of grid thumbnails to the metadata index off the GUI thread."""
+    def __init__(self, metadata_index, items):
+        super().__init__()
+        self.metadata_index = metadata_index
+        self.items = items
+        self.signals = ThumbnailWriteSignals()
+
+    def run(self):
+        try:
+            self.metadata_index.store_thumbnails(self.items)
+        finally:
+            self.signals.finished.emit()
+
 class ProcessMonitorWorker(QObject):
     """A worker that waits for a Windows process handle to close."""
     finished = Signal(str)
@@ -791,9 +3320,13 @@ class TextureToolApp(QMainWindow):
     COLOR_SOFT_GOLD = "#D4AF37"
      # Default text color
     COLOR_NUMERIC = "#88C0D0"
+    # Search criteria that pick an entry from a TextureTable facet, mapped to the facet name
+    FACET_CRITERIA = {"Format": "format", "Size": "size", "Folder": "directory"}
+    SEARCH_PAGE_ROWS = 1000 # Filename matches fetched at once; more are loaded as the results are stepped through
     def __init__(self):
         self.main_splitter = None
         self.last_displayed_index = -1 # Track for zoom reset logic.
+        self.display_pixmap_index = -1 # Preview index whose decoded image the label shows, -1 for placeholders
         self.is_image_zoomed = False   # Track for zoom reset logic.
         self.current_zoom_level = 1.0  # Track zoom factor for overlay display
         super().__init__() # CRITICAL FIX: Call the parent constructor FIRST.
@@ -834,17 +3367,38 @@ class TextureToolApp(QMainWindow):
 
         # --- CAROUSEL & EXPORT STATE ---
         self.info_cache_dir = None
-        self.preview_images = [] # This now stores comprehensive dictionaries
+        self.xbt_reader = None # Open XbtReader when Get Info ran natively
+        self.extract_output_folder = "" # Destination of the last selective extraction
+        self.last_extract_pattern = "*"
+        self.decode_pool = QThreadPool(self) # Decodes native previews straight from the XBT payload
+        self.decode_pool.setMaxThreadCount(2)
+        self.decode_request_id = 0 # Incremented per decode request
+        self.stale_request_id = 0 # Results for requests up to this ID belong to a previous gallery and are dropped
+        self.pending_decodes = {} # preview index -> queued or running FrameDecodeTask
+        self.decode_errors = {}
+        self.nav_direction = 1 # +1 / -1, the direction the prefetcher warms the cache in
+        self.thumbnail_pool = QThreadPool(self) # Builds grid thumbnails, one task per visible cell
+        self.pending_thumbnails = {} # grid row -> queued or running ThumbnailTask
+        self.thumbnail_write_queue = [] # (entry_key, texture_index, png) waiting to be written to the metadata index
+        self.thumbnail_write_task = None # ThumbnailWriteTask writing the previous batch, if still running
+        self.metadata_entry_key = "" # Metadata index key of the archive in the previewer ("" if not indexed)
+        self.preview_images = TextureTable() # Columnar records; indexing returns dict-like TextureRecord views
         self.current_preview_index = -1
         # --- SEARCH STATE ---
         self.last_search_query = ("", "") # (query, criterion)
         self.search_results = []
+        self.search_results_complete = True # False while a paged filename search has more matches to load
+        self.search_index = None # TextureSearchIndex for the current gallery
+        self.search_index_generation = 0
+        self.search_index_task = None
         self.current_search_index = -1
         # --- END SEARCH STATE ---
         self.decompile_for_info_thread = None
         self.decompile_for_info_worker = None
         self.pdf_export_thread = None
         self.pdf_export_worker = None
+        self.analysis_thread = None
+        self.analysis_worker = None
 
         # --- PDF Export Menu State ---
         self.export_pdf_menu = None
@@ -881,9 +3435,16 @@ class TextureToolApp(QMainWindow):
         self.update_thread, self.update_worker = None, None
         self.update_check_complete.connect(self._handle_update_ui)
         self._load_settings()
+        self.metadata_index = TextureMetadataIndex(os.path.join(os.path.dirname(self.config_path), 'metadata_index.sqlite'),
+                                                   max_bytes=self.metadata_index_max_mb * 1024 * 1024,
+                                                   max_thumbnail_bytes=self.thumbnail_cache_max_mb * 1024 * 1024)
+        self.image_cache = DecodedImageCache(self.preview_cache_mb * 1024 * 1024)
+        self.thumbnail_cache = DecodedImageCache(64 * 1024 * 1024) # Grid cells, and the placeholder while a full decode is pending
         self._setup_ui()
         if cleanup_was_performed:
             self._log_message(f"[INFO] Removed leftover temporary directory: {os.path.normpath(temp_dir_to_clean)}")
+        if self.metadata_index.init_error:
+            self._log_message(f"[WARN] Metadata index unavailable at {os.path.normpath(self.metadata_index.db_path)}: {self.metadata_index.init_error}")
         self._setup_temp_workspace()
         atexit.register(self._cleanup_workspace)
         self._perform_startup_checks()
@@ -993,6 +3554,8 @@ class TextureToolApp(QMainWindow):
             except Exception:
                 pass # Fail silently on exit
 
+        self._close_xbt_reader()
+
         # Clean up info cache directory
         if self.info_cache_dir and os.path.exists(self.info_cache_dir):
             try:
@@ -1303,6 +3866,9 @@ class TextureToolApp(QMainWindow):
         self.dupecheck_cb = QCheckBox("Enable dupecheck")
         self.dupecheck_cb.setToolTip("Prevents duplicate textures from being added during compilation.")
         self.dupecheck_cb.toggled.connect(self._on_dupecheck_toggled)
+        self.incremental_cb = QCheckBox("Incremental compile")
+        self.incremental_cb.setToolTip("Re-encode only new or changed images and copy the rest from the previous output file.")
+        self.incremental_cb.toggled.connect(self._on_incremental_toggled)
         self.dev_mode_cb = QCheckBox("Dev mode")
         self.dev_mode_cb.setToolTip("Enable developer mode features. Requires hotkey (Shift+Alt+D) to enable.")
         self.dev_mode_cb.setEnabled(False)
@@ -1325,6 +3891,7 @@ class TextureToolApp(QMainWindow):
         self.open_log_file_btn.setToolTip("Open the current session log file in the default editor.")
         options_layout.addWidget(self.dev_mode_cb)
         options_layout.addWidget(self.dupecheck_cb)
+        options_layout.addWidget(self.incremental_cb)
         options_layout.addStretch()
         options_layout.addWidget(self.reload_all_btn)
         options_layout.addWidget(self.close_all_btn)
@@ -1434,6 +4001,45 @@ class TextureToolApp(QMainWindow):
         self.zoom_level_label.setVisible(False) # Initially hidden
         image_container_layout.addWidget(self.zoom_level_label, 0, 0, Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft)
 
+        # --- Thumbnail Grid (virtualized: uniform item sizes, so only visible cells are asked for data) ---
+        self.thumbnail_model = ThumbnailGridModel(self.thumbnail_cache, self)
+        self.thumbnail_model.thumbnail_requested.connect(self._request_thumbnail)
+        self.thumbnail_grid_view = QListView()
+        self.thumbnail_grid_view.setViewMode(QListView.ViewMode.IconMode)
+        self.thumbnail_grid_view.setMovement(QListView.Movement.Static)
+        self.thumbnail_grid_view.setResizeMode(QListView.ResizeMode.Adjust)
+        self.thumbnail_grid_view.setLayoutMode(QListView.LayoutMode.Batched)
+        self.thumbnail_grid_view.setBatchSize(1000)
+        self.thumbnail_grid_view.setUniformItemSizes(True)
+        self.thumbnail_grid_view.setIconSize(QSize(96, 96))
+        self.thumbnail_grid_view.setGridSize(QSize(120, 124))
+        self.thumbnail_grid_view.setTextElideMode(Qt.TextElideMode.ElideMiddle)
+        self.thumbnail_grid_view.setWordWrap(False)
+        self.thumbnail_grid_view.setToolTip("Click to select, double-click to open in the previewer.")
+        self.thumbnail_grid_view.setModel(self.thumbnail_model)
+        self.thumbnail_grid_view.clicked.connect(self._on_grid_item_clicked)
+        self.thumbnail_grid_view.activated.connect(self._on_grid_item_activated)
+
+        self.preview_view_stack = QStackedWidget()
+        self.preview_view_stack.addWidget(image_container)
+        self.preview_view_stack.addWidget(self.thumbnail_grid_view)
+
+        # Queued thumbnails that scrolled out of view are cancelled once scrolling settles.
+        self.thumbnail_scroll_timer = QTimer(self)
+        self.thumbnail_scroll_timer.setSingleShot(True)
+        self.thumbnail_scroll_timer.setInterval(150)
+        self.thumbnail_scroll_timer.timeout.connect(self._cancel_offscreen_thumbnails)
+        self.thumbnail_grid_view.verticalScrollBar().valueChanged.connect(lambda: self.thumbnail_scroll_timer.start())
+        # New thumbnails are written to the metadata index in batches.
+        self.thumbnail_flush_timer = QTimer(self)
+        self.thumbnail_flush_timer.setSingleShot(True)
+        self.thumbnail_flush_timer.setInterval(1000)
+        self.thumbnail_flush_timer.timeout.connect(self._flush_thumbnail_writes)
+        # While Get Info runs, rows that have arrived so far are pushed to the gallery in batches.
+        self.gallery_stream_timer = QTimer(self)
+        self.gallery_stream_timer.setInterval(250)
+        self.gallery_stream_timer.timeout.connect(self._on_gallery_rows_streamed)
+
         # 2. Main Info/Filename Label
         self.image_info_label = QLabel("(0 / 0)")
         self.image_info_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
@@ -1474,19 +4080,28 @@ class TextureToolApp(QMainWindow):
         self.btn_zoom_out.setToolTip("Zoom Out")
         self.btn_fit_to_window = QPushButton(qta.icon('fa5s.expand'), "")
         self.btn_fit_to_window.setToolTip("Fit to Window")
+        self.btn_grid_view = QPushButton(qta.icon('fa5s.th'), "")
+        self.btn_grid_view.setToolTip("Toggle Thumbnail Grid")
+        self.btn_grid_view.setCheckable(True)
         # --- SEARCH CONTROLS ---
         jump_to_label = QLabel("Search by:")
         self.search_criteria_combo = QComboBox()
-        self.search_criteria_combo.addItems(["Filename", "Index", "Dimensions"])
+        self.search_criteria_combo.addItems(["Filename", "Index", "Dimensions", "Format", "Size", "Folder", "Query"])
         self.search_criteria_combo.setToolTip("Select the criteria to search by.")
         self.image_jump_to_edit = QLineEdit()
         self.image_jump_to_edit.setToolTip("Enter search term and press Enter or use Find buttons.")
         self.dimensions_filter_combo = QComboBox()
         self.dimensions_filter_combo.setToolTip("Filter images by their dimensions.")
+        self.facet_filter_combo = QComboBox()
+        self.facet_filter_combo.setToolTip("Filter images by the selected attribute.")
         self._populate_dimensions_filter()
         self.search_input_stack = QStackedWidget()
         self.search_input_stack.addWidget(self.image_jump_to_edit)
         self.search_input_stack.addWidget(self.dimensions_filter_combo)
+        self.search_input_stack.addWidget(self.facet_filter_combo)
+        self.search_match_label = QLabel("")
+        self.search_match_label.setObjectName("ImageDetailsLabel")
+        self.search_match_label.setToolTip("Number of textures matching the current search.")
         self.btn_find_prev = QPushButton(qta.icon('fa5s.chevron-left'), "")
         self.btn_find_prev.setToolTip("Find Previous Match")
         self.btn_find_next = QPushButton(qta.icon('fa5s.chevron-right'), "")
@@ -1494,9 +4109,9 @@ class TextureToolApp(QMainWindow):
         self.image_nav_slider = QSlider(Qt.Orientation.Horizontal)
         self.image_nav_slider.setToolTip("Scrub through images quickly.")
         # Set fixed sizes for a consistent look matching the mock-up
-        for btn in [self.btn_first, self.btn_prev, self.btn_next, self.btn_last, self.export_pdf_btn, self.btn_find_prev, self.btn_find_next, self.btn_zoom_out, self.btn_zoom_in, self.btn_fit_to_window]:
+        for btn in [self.btn_first, self.btn_prev, self.btn_next, self.btn_last, self.export_pdf_btn, self.btn_find_prev, self.btn_find_next, self.btn_zoom_out, self.btn_zoom_in, self.btn_fit_to_window, self.btn_grid_view]:
             btn.setFixedHeight(30)
-        for btn in [self.btn_find_prev, self.btn_find_next, self.btn_first, self.btn_prev, self.btn_next, self.btn_last, self.btn_zoom_out, self.btn_zoom_in, self.btn_fit_to_window]:
+        for btn in [self.btn_find_prev, self.btn_find_next, self.btn_first, self.btn_prev, self.btn_next, self.btn_last, self.btn_zoom_out, self.btn_zoom_in, self.btn_fit_to_window, self.btn_grid_view]:
             btn.setFixedWidth(40)
         self.search_criteria_combo.setFixedWidth(100)
         self.search_input_stack.setFixedWidth(360)
@@ -1510,6 +4125,7 @@ class TextureToolApp(QMainWindow):
         zoom_controls_layout.addWidget(self.btn_zoom_in)        
         zoom_controls_layout.addWidget(self.btn_zoom_out)
         zoom_controls_layout.addWidget(self.btn_fit_to_window)
+        zoom_controls_layout.addWidget(self.btn_grid_view)
         # Add widgets to the top row layout to center the group
         #top_controls_layout.addStretch(1)
         top_controls_layout.addLayout(zoom_controls_layout)
@@ -1539,12 +4155,13 @@ class TextureToolApp(QMainWindow):
         bottom_controls_layout.addWidget(jump_to_label)
         bottom_controls_layout.addWidget(self.search_criteria_combo)
         bottom_controls_layout.addWidget(self.search_input_stack)
-        bottom_controls_layout.addSpacing(0)
+        bottom_controls_layout.addSpacing(6)
+        bottom_controls_layout.addWidget(self.search_match_label)
         bottom_controls_layout.addStretch(1)
         bottom_controls_layout.addWidget(self.btn_find_prev)
         bottom_controls_layout.addWidget(self.btn_find_next)
         # --- Add all widgets and layouts to the main previewer layout ---
-        previewer_layout.addWidget(image_container, 1) # Give vertical stretch
+        previewer_layout.addWidget(self.preview_view_stack, 1) # Give vertical stretch
         previewer_layout.addLayout(top_controls_layout)
         previewer_layout.addLayout(middle_controls_layout)
         previewer_layout.addLayout(bottom_controls_layout)
@@ -1570,13 +4187,25 @@ class TextureToolApp(QMainWindow):
         self.btn_zoom_out.clicked.connect(self._zoom_out)
         self.btn_zoom_in.clicked.connect(self._zoom_in)
         self.btn_fit_to_window.clicked.connect(self._fit_to_window)
+        self.btn_grid_view.toggled.connect(self._toggle_grid_view)
         self.image_jump_to_edit.returnPressed.connect(self._find_next_match)
-        self.image_jump_to_edit.textChanged.connect(self._find_first_match)
+        self.image_jump_to_edit.textChanged.connect(self._on_search_text_changed)
         self.btn_find_prev.clicked.connect(self._find_previous_match)
         self.btn_find_next.clicked.connect(self._find_next_match)
         self.search_criteria_combo.currentIndexChanged.connect(self._on_search_criterion_changed)
         self.dimensions_filter_combo.currentIndexChanged.connect(self._find_first_match)
+        self.facet_filter_combo.currentIndexChanged.connect(self._find_first_match)
         self.image_nav_slider.valueChanged.connect(handle_slider_change)
+
+        # --- Debounced search: keystrokes restart the timers, so only the final query is searched and decoded ---
+        self.search_debounce_timer = QTimer(self)
+        self.search_debounce_timer.setSingleShot(True)
+        self.search_debounce_timer.setInterval(120)
+        self.search_debounce_timer.timeout.connect(self._run_debounced_search)
+        self.search_jump_timer = QTimer(self)
+        self.search_jump_timer.setSingleShot(True)
+        self.search_jump_timer.setInterval(350)
+        self.search_jump_timer.timeout.connect(self._jump_to_first_debounced_match)
         # --- Final Splitter setup (unchanged) ---
         self.right_panel_splitter = QSplitter(Qt.Orientation.Vertical)
         if self.log_on_top:
@@ -1741,19 +4370,181 @@ This function is thread-safe. For batch operations, use the log_message_buffer i
             return
 
         self._set_ui_task_active(True)
-        task_name = "decompile"
         title_message = "[INFO] ----- Decompilation Start -----"
         status_message = "Decompile in progress... Please wait"
-        process_cwd = os.path.join(self.workspace_dir, "utils", "TexturePacker_Decompile")
-        exe_path = os.path.join(process_cwd, "TextureExtractor.exe")
-        norm_output_folder = os.path.normpath(self.decompile_output_folder)
-        command = [exe_path, "-o", norm_output_folder, "-c", os.path.normpath(self.decompile_input_file)]
 
         self._log_message(title_message)
 
         self.progress_bar.setValue(0)
         self.status_label.setText(status_message)
         self._show_tray_message(APP_TITLE, status_message)
+        extractor_exe = os.path.join(self.workspace_dir, "utils", "TexturePacker_Decompile", "TextureExtractor.exe")
+        if _lzo_backend is None and os.path.exists(extractor_exe):
+            # Without python-lzo the built-in reader decodes LZO in pure Python, slower than TextureExtractor.
+            self._log_message("[INFO] python-lzo is not installed; decompiling with TextureExtractor.")
+            self._start_decompile_with_extractor()
+        else:
+            self._start_native_decompile()
+    def _start_native_decompile(self, xbt_path=None, output_dir=None, selection=None):
+        '''Extracts every frame (or only the selected textures) in-process on a process pool, one XBT directory chunk per task.'''
+        workers = self.decompile_workers or os.cpu_count() or 1
+        if selection is None:
+            self._log_message(f"[INFO] Extracting frames natively with {workers} worker process(es).")
+        if _lzo_backend is None:
+            self._log_message("[WARN] python-lzo is not installed; using the slower pure-Python LZO decoder.")
+        task_name = "decompile" if selection is None else "extract"
+
+        self.decompile_thread = QThread(self)
+        self.decompile_worker = XbtExtractWorker(os.path.normpath(xbt_path or self.decompile_input_file),
+                                                 os.path.normpath(output_dir or self.decompile_output_folder), workers, selection)
+        self.decompile_worker.moveToThread(self.decompile_thread)
+
+        self.decompile_worker.progress_updated.connect(functools.partial(self._update_progress_from_worker, prefix="Decompiling"))
+
+        self.decompile_worker.finished.connect(self.decompile_thread.quit)
+        self.decompile_worker.error.connect(self.decompile_thread.quit)
+        self.decompile_worker.finished.connect(self.decompile_worker.deleteLater)
+        self.decompile_worker.error.connect(self.decompile_worker.deleteLater)
+        self.decompile_thread.finished.connect(self.decompile_thread.deleteLater)
+
+        self.decompile_thread.started.connect(self.decompile_worker.run)
+        self.decompile_worker.finished.connect(lambda code, out: self._on_process_finished(task_name, code, out))
+        if selection is None:
+            self.decompile_worker.error.connect(self._on_native_decompile_failed)
+        else:
+            # TextureExtractor can only unpack everything, so a selective run has no fallback.
+            self.decompile_worker.error.connect(lambda err: self._on_process_finished(task_name, -1, err))
+        self.decompile_thread.start()
+    def _start_selective_extract(self, selection, description):
+        '''Extracts only the selected textures of the previewed XBT file into a folder chosen by the user.'''
+        if any(t is not None for t in (self.decompile_thread, self.compile_thread, self.info_thread, self.installer_thread, self.pdf_export_thread)):
+            self._log_message("[WARN] Another task is already in progress. Please wait.")
+            return
+        xbt_path = self.xbt_reader.path if self.xbt_reader is not None else self.decompile_input_file
+        if not xbt_path or not os.path.isfile(xbt_path):
+            self._log_message("[ERROR] Cannot extract, the source .xbt file is not available.")
+            return
+
+        start_dir = self.decompile_output_folder or self._get_config_path('decompileoutput')
+        output_dir = QFileDialog.getExistingDirectory(self, f"Extract {description} to...", start_dir)
+        if not output_dir:
+            return
+
+        self._set_ui_task_active(True)
+        self.extract_output_folder = output_dir
+        self._log_message(f"[INFO] ----- Extracting {description} -----")
+        self.progress_bar.setValue(0)
+        self.status_label.setText(f"Extracting {description}... Please wait")
+        self._start_native_decompile(xbt_path, output_dir, selection)
+    def _extract_search_results(self):
+        '''Extracts the textures matched by the current search.'''
+        if not self.search_results:
+            self._log_message("[WARN] No active search results to extract.")
+            return
+        self._load_more_search_results(all_rows=True)
+        self._start_selective_extract(self._extract_selection(self.search_results), f"{len(self.search_results)} matching texture(s)")
+    def _extract_current_texture(self):
+        '''Extracts the texture shown in the previewer.'''
+        if self.current_preview_index != -1:
+            filename = self.preview_images[self.current_preview_index]['filename']
+            self._start_selective_extract(self._extract_selection([self.current_preview_index]), f"'{filename}'")
+    def _extract_by_pattern(self):
+        '''Prompts for a glob such as */buttons/* and extracts the textures whose paths match it.'''
+        dialog = QInputDialog(self)
+        dialog.setWindowTitle("Extract Matching Textures")
+        dialog.setLabelText("Texture path pattern (* and ? wildcards, e.g. */buttons/*):")
+        dialog.setTextValue(self.last_extract_pattern)
+        dialog.setInputMode(QInputDialog.InputMode.TextInput)
+        for button in dialog.findChildren(QPushButton):
+            button.setMinimumSize(100, 30)
+        if dialog.exec() and dialog.textValue().strip():
+            self.last_extract_pattern = dialog.textValue().strip()
+            self._start_selective_extract(self.last_extract_pattern, f"textures matching '{self.last_extract_pattern}'")
+    def _extract_selection(self, rows):
+        '''Maps gallery rows to an XbtExtractWorker selection: texture indexes when Get Info ran natively, otherwise names.'''
+        records = [self.preview_images[row] for row in rows]
+        if self.xbt_reader is not None and all(record.get('texture_index', -1) >= 0 for record in records):
+            return [record['texture_index'] for record in records]
+        return [record['filename'] for record in records]
+    def _find_near_duplicates_in_info(self):
+        '''Runs the near-duplicate report over the textures listed by Get Info.'''
+        if not self.preview_images:
+            self._log_message("[WARN] Run Get Info first to analyze a texture file.")
+            return
+        if self.xbt_reader is not None:
+            items = []
+            for record in self.preview_images:
+                texture_index = record.get('texture_index', -1)
+                texture = self.xbt_reader[texture_index] if 0 <= texture_index < len(self.xbt_reader) else None
+                frame = texture.frames[0] if texture is not None and texture.frames else None
+                if frame is None:
+                    continue
+                items.append((record['filename'], record.get('size', 0),
+                              (frame.width, frame.height, frame.format, frame.packed_size, frame.unpacked_size, frame.offset)))
+            skipped = len(self.preview_images) - len(items)
+            if skipped:
+                self._log_message(f"[WARN] Skipping {skipped} texture(s) with no frame data.")
+            worker = NearDuplicateWorker(xbt_path=self.xbt_reader.path, items=items)
+        else:
+            # TextureExtractor's info run left the images in the info cache.
+            worker = NearDuplicateWorker(items=[(record['filename'], record.get('size', 0), record['path']) for record in self.preview_images])
+        self._start_near_duplicate_worker(worker, f"{len(self.preview_images)} textures")
+    def _find_near_duplicates_in_folder(self):
+        '''Runs the near-duplicate report over the images of the compile input folder.'''
+        if not self.compile_input_folder or not os.path.isdir(self.compile_input_folder):
+            self._log_message("[WARN] Select a compile input folder first.")
+            return
+        self._start_near_duplicate_worker(NearDuplicateWorker(folder=os.path.normpath(self.compile_input_folder)),
+                                          f"'{self.compile_input_folder}'")
+    def _start_near_duplicate_worker(self, worker, description):
+        '''Runs a NearDuplicateWorker on its own thread; the report goes to the log.'''
+        if any(t is not None for t in (self.decompile_thread, self.compile_thread, self.info_thread, self.installer_thread,
+                                       self.pdf_export_thread, self.analysis_thread)):
+            self._log_message("[WARN] Another task is already in progress. Please wait.")
+            return
+        self._set_ui_task_active(True)
+        self._log_message(f"[INFO] ----- Near-Duplicate Scan of {description} -----")
+        self.progress_bar.setValue(0)
+        self.status_label.setText("Looking for near-duplicate images... Please wait")
+
+        self.analysis_thread = QThread(self)
+        self.analysis_worker = worker
+        self.analysis_worker.moveToThread(self.analysis_thread)
+        self.analysis_worker.progress_updated.connect(functools.partial(self._update_progress_from_worker, prefix="Analyzing"))
+
+        self.analysis_worker.finished.connect(self.analysis_thread.quit)
+        self.analysis_worker.error.connect(self.analysis_thread.quit)
+        self.analysis_worker.finished.connect(self.analysis_worker.deleteLater)
+        self.analysis_worker.error.connect(self.analysis_worker.deleteLater)
+        self.analysis_thread.finished.connect(self.analysis_thread.deleteLater)
+
+        self.analysis_thread.started.connect(self.analysis_worker.run)
+        self.analysis_worker.finished.connect(self._on_near_duplicate_scan_finished)
+        self.analysis_worker.error.connect(self._on_near_duplicate_scan_failed)
+        self.analysis_thread.start()
+    def _on_near_duplicate_scan_finished(self, report):
+        '''Writes the near-duplicate report to the log.'''
+        self._log_info_lines(report)
+        self.status_label.setText("Near-duplicate scan complete.")
+        self._reset_ui_after_task()
+    def _on_near_duplicate_scan_failed(self, error_message):
+        '''Reports a near-duplicate scan that could not run.'''
+        self._log_message(f"[ERROR] Near-duplicate scan failed: {error_message}")
+        self.status_label.setText("Near-duplicate scan failed.")
+        self._reset_ui_after_task()
+    def _on_native_decompile_failed(self, error_message):
+        '''Falls back to TextureExtractor when the native reader cannot open the file.'''
+        self.decompile_thread, self.decompile_worker = None, None
+        self._log_message(f"[WARN] Native XBT reader unavailable for this file: {error_message}")
+        self._log_message("[INFO] Falling back to TextureExtractor.")
+        self._start_decompile_with_extractor()
+    def _start_decompile_with_extractor(self):
+        '''Fallback decompile through the bundled TextureExtractor.exe.'''
+        task_name = "decompile"
+        process_cwd = os.path.join(self.workspace_dir, "utils", "TexturePacker_Decompile")
+        exe_path = os.path.join(process_cwd, "TextureExtractor.exe")
+        norm_output_folder = os.path.normpath(self.decompile_output_folder)
+        command = [exe_path, "-o", norm_output_folder, "-c", os.path.normpath(self.decompile_input_file)]
 
         log_command = " ".join([f'"{arg}"' if " " in arg else arg for arg in command])
         self._log_message(f'[DATA] {datetime.now().strftime("%H:%M:%S")}: Running command: {log_command}')
@@ -1772,7 +4563,10 @@ This function is thread-safe. For batch operations, use the log_message_buffer i
         self.decompile_worker.finished.connect(self.decompile_worker.deleteLater)
         self.decompile_thread.start()
     def _start_get_info(self):
-        '''Orchestrates the two-stage Get Info process: silent extract, then info scan.'''
+        '''
+Orchestrates Get Info. The XBT directory is read natively in a single pass; the
+two-stage extract + info scan is only used as a fallback for unreadable files.
+'''
         if any(t is not None for t in (self.decompile_thread, self.compile_thread, self.info_thread, self.installer_thread, self.decompile_for_info_thread)):
             self._log_message("[WARN] Another task is already in progress. Please wait.")
             return
@@ -1810,13 +4604,13 @@ This function is thread-safe. For batch operations, use the log_message_buffer i
         except Exception as e:
             self._log_message("[WARN] An error occurred during temp folder cleanup: {}".format(e))
 
-        # --- PHASE 1: SILENT DECOMPILATION ---
         self._log_message("[INFO] ----- Starting Get Info -----")
 
         # --- CRITICAL FIX: UNLOAD UI BEFORE FILE DELETION ---
         # 1. Clear data source to release locks
         self.preview_images.clear()
         self.current_preview_index = -1
+        self._close_xbt_reader()
 
         # 2. Reset search (updates UI to empty state)
         self._reset_search_state()
@@ -1843,6 +4637,8 @@ This function is thread-safe. For batch operations, use the log_message_buffer i
                     long_path_cache_dir = buffer.value
 
             self.info_cache_dir = long_path_cache_dir
+            # Streamed batches derive their paths from the same cache dir, so rows need no explicit path.
+            self.preview_images.cache_dir = self.info_cache_dir
             self._log_message("[INFO] Created temporary image cache: {}".format(self.info_cache_dir))
         except Exception as e:
             self._log_message("[ERROR] Could not create temporary cache directory: {}".format(e))
@@ -1852,6 +4648,32 @@ This function is thread-safe. For batch operations, use the log_message_buffer i
         self._set_ui_task_active(True)
         self.progress_bar.setRange(0, 100)
         self.progress_bar.setValue(0)
+        self._start_native_get_info()
+    def _start_native_get_info(self):
+        '''Single-pass Get Info: reads the XBT directory in-process. Frames are decoded only when displayed.'''
+        self.status_label.setText("Reading texture directory...")
+
+        self.info_thread = QThread(self)
+        self.info_worker = XbtInfoWorker(os.path.normpath(self.decompile_input_file), self.info_cache_dir, self.metadata_index)
+        self.info_worker.moveToThread(self.info_thread)
+
+        self.info_worker.progress_updated.connect(self._on_native_info_progress)
+        self.info_worker.records_streamed.connect(self._on_native_records_streamed)
+
+        self.info_worker.finished.connect(self.info_thread.quit)
+        self.info_worker.error.connect(self.info_thread.quit)
+        self.info_worker.finished.connect(self.info_worker.deleteLater)
+        self.info_worker.error.connect(self.info_worker.deleteLater)
+        self.info_thread.finished.connect(self.info_thread.deleteLater)
+
+        self.info_thread.started.connect(self.info_worker.run)
+        self.info_worker.finished.connect(self._on_native_info_finished)
+        self.info_worker.error.connect(self._on_native_info_failed)
+
+        self.gallery_stream_timer.start()
+        self.info_thread.start()
+    def _start_get_info_phase1(self):
+        '''Fallback phase 1 of Get Info: silent extraction of every frame into the info cache.'''
         self.status_label.setText("Step 1/2: Caching images...")
 
         decompile_cwd = os.path.join(self.workspace_dir, "utils", "TexturePacker_Decompile")
@@ -1927,17 +4749,79 @@ This function is thread-safe. For batch operations, use the log_message_buffer i
             self._log_message("[ERROR] Cannot compile, workspace not available.")
             return
 
-        norm_input_folder = os.path.normpath(self.compile_input_folder)
         norm_output_file = os.path.normpath(self.compile_output_file)
+        if self.xbt_reader is not None and os.path.normcase(os.path.abspath(self.xbt_reader.path)) == os.path.normcase(os.path.abspath(norm_output_file)):
+            # The gallery keeps the output file mapped, and Windows can't replace or truncate a file while it is open.
+            if self.pdf_export_thread is not None or self.analysis_thread is not None:
+                self._log_message("[WARN] The output file is still being read by another task. Please wait.")
+                return
+            self._log_message("[INFO] Closing the gallery of the output file before compiling over it.")
+            self._clear_gallery()
 
         try:
-            with open(norm_output_file, 'w', encoding='utf-8') as f:
+            # Append mode only checks the file can be written; a failed compile leaves the previous output intact.
+            with open(norm_output_file, 'a', encoding='utf-8') as f:
                 pass
         except IOError as e:
             self._log_message(f"[ERROR] Could not create output file: {e}")
             return
 
         self._set_ui_task_active(True)
+        self.progress_bar.setValue(0)
+        self.status_label.setText("Compile in progress... Please wait")
+        self._show_tray_message(APP_TITLE, "Compile in progress...")
+
+        if self.dev_mode_cb.isChecked() or _lzo_backend is None:
+            # The native writer has no command to preview, and packing needs python-lzo.
+            if self.incremental_cb.isChecked():
+                self._log_message("[WARN] Incremental compile needs the built-in compiler; rebuilding everything with TextureCompiler.")
+            self._start_compile_with_compiler()
+        else:
+            self._start_native_compile()
+    def _start_native_compile(self):
+        '''Packs the input folder in-process, decoding and LZO-compressing images on a process pool.'''
+        workers = self.compile_workers or os.cpu_count() or 1
+        incremental = self.incremental_cb.isChecked()
+        mode = "incrementally" if incremental else "natively"
+        self._log_message(f"[INFO] Compiling {mode} with {workers} worker process(es).")
+
+        self.compile_thread = QThread(self)
+        self.compile_worker = XbtCompileWorker(os.path.normpath(self.compile_input_folder), os.path.normpath(self.compile_output_file),
+                                               workers, incremental, self.dupecheck_cb.isChecked())
+        self.compile_worker.moveToThread(self.compile_thread)
+
+        self.compile_worker.progress_updated.connect(functools.partial(self._update_progress_from_worker, prefix="Compiling"))
+        self.compile_worker.scan_summary.connect(self._log_info_lines)
+
+        self.compile_worker.finished.connect(self.compile_thread.quit)
+        self.compile_worker.error.connect(self.compile_thread.quit)
+        self.compile_worker.finished.connect(self.compile_worker.deleteLater)
+        self.compile_worker.error.connect(self.compile_worker.deleteLater)
+        self.compile_thread.finished.connect(self.compile_thread.deleteLater)
+
+        self.compile_thread.started.connect(self.compile_worker.run)
+        self.compile_worker.finished.connect(self._on_native_compile_finished)
+        self.compile_worker.error.connect(self._on_native_compile_failed)
+        self.compile_thread.start()
+    def _on_native_compile_finished(self, return_code, output):
+        '''Logs the native writer's summary, then runs the shared compile completion.'''
+        if return_code == 0:
+            self._log_info_lines(output)
+        self._on_process_finished("compile", return_code, output)
+    def _log_info_lines(self, text):
+        '''Logs a multi-line worker report as one [INFO] entry per line.'''
+        for line in text.splitlines():
+            self._log_message(f"[INFO] {line}")
+    def _on_native_compile_failed(self, error_message):
+        '''Falls back to TextureCompiler when the native writer cannot run.'''
+        self.compile_thread, self.compile_worker = None, None
+        self._log_message(f"[WARN] Native compile unavailable: {error_message}")
+        self._log_message("[INFO] Falling back to TextureCompiler.")
+        self._start_compile_with_compiler()
+    def _start_compile_with_compiler(self):
+        '''Compile through the bundled TextureCompiler.exe, used in dev mode and when python-lzo is missing.'''
+        norm_input_folder = os.path.normpath(self.compile_input_folder)
+        norm_output_file = os.path.normpath(self.compile_output_file)
         process_cwd = os.path.join(self.workspace_dir, "utils", "TexturePacker_Compile")
         exe_path = os.path.join(process_cwd, "TextureCompiler.exe")
 
@@ -1954,10 +4838,6 @@ This function is thread-safe. For batch operations, use the log_message_buffer i
             self._log_message(f"[DEV] Displayed command preview to user.")
         # --- END DEV MODE ---
 
-        self.progress_bar.setValue(0)
-        self.status_label.setText("Compile in progress... Please wait")
-        self._show_tray_message(APP_TITLE, "Compile in progress...")
-
         log_command = " ".join([f'"{arg}"' if " " in arg else arg for arg in command_parts])
         self._log_message(f'[DATA] {datetime.now().strftime("%H:%M:%S")}: Running command: {log_command}')
 
@@ -2022,6 +4902,7 @@ This function is thread-safe. For batch operations, use the log_message_buffer i
         self.installer_thread, self.installer_worker = None, None
         self.decompile_for_info_thread, self.decompile_for_info_worker = None, None
         self.pdf_export_thread, self.pdf_export_worker = None, None
+        self.analysis_thread, self.analysis_worker = None, None
 
         # Re-enable the UI controls IMMEDIATELY.
         self._set_ui_task_active(False)
@@ -2035,6 +4916,7 @@ This function is thread-safe. For batch operations, use the log_message_buffer i
         QTimer.singleShot(2000, self._finalize_ui_reset)
     def _on_process_finished(self, task_name, return_code, output):
         if task_name == "decompile_info":
+            self.gallery_stream_timer.stop()
             if return_code != 0:
                 self._log_message("[ERROR] Get Info task failed with code: {}.".format(return_code))
                 if output: self._log_message("[ERROR] {}".format(output))
@@ -2046,14 +4928,17 @@ This function is thread-safe. For batch operations, use the log_message_buffer i
 
             # --- FALLBACK SCAN START ---
             try:
-                if not self.preview_images:
+                if not self.preview_images and self.xbt_reader is None:
                     self._scan_cache_dir_fallback()
             except Exception as e:
                 self._log_message("[ERROR] Fallback scan failed: {}".format(e))
             # --- FALLBACK SCAN END ---
 
-            if self.preview_images:
+            if self.preview_images and self.current_preview_index == -1:
                 self.current_preview_index = 0
+            # Rows streamed during the run are already in the grid; only the remainder is inserted.
+            self.thumbnail_model.append_rows(self.preview_images)
+            self._start_search_index_build()
 
             # Update UI safely
             self._update_previewer_ui()
@@ -2077,6 +4962,8 @@ This function is thread-safe. For batch operations, use the log_message_buffer i
             self._log_message("[INFO] ----- {} Complete -----".format(task_name.capitalize()))
             if task_name == "decompile" and self.open_decompile_on_complete:
                 self._delayed_open_folder(self.decompile_output_folder)
+            elif task_name == "extract" and self.open_decompile_on_complete:
+                self._delayed_open_folder(self.extract_output_folder)
             elif task_name == "compile" and self.open_compile_on_complete:
                 self._delayed_open_folder(os.path.dirname(self.compile_output_file))
             self._show_tray_message(APP_TITLE, "{} complete!".format(task_name.capitalize()))
@@ -2406,6 +5293,15 @@ This function is thread-safe. For batch operations, use the log_message_buffer i
         self.reinstall_runtimes_action.setIcon(qta.icon('fa5s.sync-alt'))
         self.reinstall_runtimes_action.triggered.connect(self._install_runtimes)
         options_menu.addAction(self.reinstall_runtimes_action)
+        tools_menu = menu_bar.addMenu("&Tools")
+        near_duplicates_info_action = QAction(qta.icon('fa5s.clone'), "Find Near-Duplicates in Get Info Results", self)
+        near_duplicates_info_action.setToolTip("Report textures of the previewed .xbt that look the same, with the space they waste")
+        near_duplicates_info_action.triggered.connect(self._find_near_duplicates_in_info)
+        tools_menu.addAction(near_duplicates_info_action)
+        near_duplicates_folder_action = QAction(qta.icon('fa5s.clone'), "Find Near-Duplicates in Compile Input Folder", self)
+        near_duplicates_folder_action.setToolTip("Report source images of the compile input folder that look the same")
+        near_duplicates_folder_action.triggered.connect(self._find_near_duplicates_in_folder)
+        tools_menu.addAction(near_duplicates_folder_action)
         help_menu = menu_bar.addMenu("&Help")
         about_action = QAction(qta.icon('fa5s.info-circle'), "&About", self)
         about_action.setToolTip("Show application information")
@@ -2700,6 +5596,12 @@ start "" /d "%APP_DIR%\\.." "%APP_DIR%\\..\\%APP_EXE_TO_KILL%"
         self.log_on_top = self.config.getboolean('Settings', 'log_on_top', fallback=True)
         self.decompile_on_top = self.config.getboolean('Settings', 'decompile_on_top', fallback=False)
         self.dev_update_url = self.config.get('Settings', 'dev_update_url', fallback='https://raw.githubusercontent.com/kittmaster/KodiTextureTool/main/version.json')
+        self.metadata_index_max_mb = self.config.getint('Settings', 'metadata_index_max_mb', fallback=64)
+        self.preview_cache_mb = self.config.getint('Settings', 'preview_cache_mb', fallback=256)
+        self.preview_prefetch_count = self.config.getint('Settings', 'preview_prefetch_count', fallback=2)
+        self.decompile_workers = self.config.getint('Settings', 'decompile_workers', fallback=0) # 0 = one per core
+        self.compile_workers = self.config.getint('Settings', 'compile_workers', fallback=0) # 0 = one per core
+        self.thumbnail_cache_max_mb = self.config.getint('Settings', 'thumbnail_cache_max_mb', fallback=256)
     def _save_settings(self):
         """Saves current settings to the config file."""
         self.config.read(self.config_path, encoding='utf-8')
@@ -2712,6 +5614,12 @@ start "" /d "%APP_DIR%\\.." "%APP_DIR%\\..\\%APP_EXE_TO_KILL%"
         self.config.set('Settings', 'log_on_top', str(self.log_on_top))
         self.config.set('Settings', 'decompile_on_top', str(self.decompile_on_top))
         self.config.set('Settings', 'dev_update_url', str(self.dev_update_url))
+        self.config.set('Settings', 'metadata_index_max_mb', str(self.metadata_index_max_mb))
+        self.config.set('Settings', 'preview_cache_mb', str(self.preview_cache_mb))
+        self.config.set('Settings', 'preview_prefetch_count', str(self.preview_prefetch_count))
+        self.config.set('Settings', 'decompile_workers', str(self.decompile_workers))
+        self.config.set('Settings', 'compile_workers', str(self.compile_workers))
+        self.config.set('Settings', 'thumbnail_cache_max_mb', str(self.thumbnail_cache_max_mb))
         with open(self.config_path, 'w', encoding='utf-8') as configfile:
             self.config.write(configfile)
 
@@ -2744,6 +5652,8 @@ start "" /d "%APP_DIR%\\.." "%APP_DIR%\\..\\%APP_EXE_TO_KILL%"
                 self.image_nav_slider.blockSignals(True)
 
             if self.current_preview_index != self.last_displayed_index:
+                if self.current_preview_index != -1 and self.last_displayed_index != -1:
+                    self.nav_direction = 1 if self.current_preview_index > self.last_displayed_index else -1
                 self.is_image_zoomed = False
                 self.last_displayed_index = self.current_preview_index
                 self.current_zoom_level = 1.0
@@ -2753,6 +5663,7 @@ start "" /d "%APP_DIR%\\.." "%APP_DIR%\\..\\%APP_EXE_TO_KILL%"
             is_search_active = bool(self.search_results) and self.current_search_index != -1
 
             if not self.preview_images or self.current_preview_index == -1:
+                self.display_pixmap_index = -1
                 placeholder_icon = qta.icon('fa5s.ban', color='#4c566a')
                 placeholder_pixmap = placeholder_icon.pixmap(QSize(128, 128))
                 self.image_display_label.setPixmap(placeholder_pixmap)
@@ -2781,45 +5692,49 @@ start "" /d "%APP_DIR%\\.." "%APP_DIR%\\..\\%APP_EXE_TO_KILL%"
                     if self.image_nav_slider.maximum() != total_previews - 1:
                         self.image_nav_slider.setRange(0, total_previews - 1)
                     self.image_nav_slider.setValue(current_preview)
+                    if self.preview_view_stack.currentIndex() == 1:
+                        self.thumbnail_grid_view.setCurrentIndex(self.thumbnail_model.index(current_preview))
 
                 image_data = self.preview_images[current_preview]
 
                 # --- SAFER LOADING STRATEGY ---
                 original_pixmap = None
                 error_reason = "Unknown Error"
+                decode_pending = False
 
                 try:
-                    if not os.path.exists(image_data['path']):
+                    cached_image = self.image_cache.get(self._display_cache_key(current_preview))
+                    if cached_image is not None:
+                        original_pixmap = QPixmap.fromImage(cached_image)
+                    elif current_preview in self.decode_errors:
+                        error_reason = self.decode_errors[current_preview]
+                    elif not self._is_native_record(image_data) and not os.path.exists(image_data['path']):
                         error_reason = "File not found"
                     else:
-                        reader = QImageReader(image_data['path'])
-                        reader.setAllocationLimit(0) 
-                        reader.setAutoTransform(True)
-
-                        if reader.canRead():
-                            size = reader.size()
-
-                            # Lazy update of dimensions if missing
-                            if image_data.get('dimensions') == 'N/A' or not image_data.get('dimensions'):
-                                image_data['dimensions'] = "{}x{}".format(size.width(), size.height())
-
-                            max_dim = 8192
-
-                            if size.width() > max_dim or size.height() > max_dim:
-                                reader.setScaledSize(size.scaled(max_dim, max_dim, Qt.AspectRatioMode.KeepAspectRatio))
-
-                            img = reader.read()
-                            if not img.isNull():
-                                original_pixmap = QPixmap.fromImage(img)
-                            else:
-                                error_reason = reader.errorString()
-                        else:
-                            error_reason = reader.errorString()
+                        # Decoded on the decode pool; _on_frame_decoded re-enters here once the image is cached.
+                        decode_pending = True
+                        self._cancel_stale_decodes({current_preview, *self._prefetch_window(current_preview)})
+                        self._request_frame_decode(current_preview, image_data, priority=1)
                 except Exception as e:
                     error_reason = str(e)
 
                 # --- UI UPDATE ---
-                if original_pixmap is None or original_pixmap.isNull():
+                if decode_pending and self.display_pixmap_index == current_preview:
+                    pass # Re-fitting after a resize: the image stays up until the new size arrives.
+                elif decode_pending:
+                    self.display_pixmap_index = -1
+                    self.image_display_label.setStyleSheet("border: 1px solid #4c566a; border-radius: 3px; background-color: #3b4252;")
+                    thumbnail = self.thumbnail_cache.get(current_preview)
+                    label_size = self.image_display_label.size()
+                    if thumbnail is not None and label_size.width() > 0 and label_size.height() > 0:
+                        placeholder_pixmap = QPixmap.fromImage(thumbnail)
+                        if thumbnail.width() >= PREVIEW_THUMBNAIL_SIZE or thumbnail.height() >= PREVIEW_THUMBNAIL_SIZE:
+                            placeholder_pixmap = placeholder_pixmap.scaled(label_size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.FastTransformation)
+                    else:
+                        placeholder_pixmap = qta.icon('fa5s.hourglass-half', color='#4c566a').pixmap(QSize(64, 64))
+                    self.image_display_label.setPixmap(placeholder_pixmap)
+                elif original_pixmap is None or original_pixmap.isNull():
+                    self.display_pixmap_index = -1
                     fail_msg = "Preview Unavailable\n\nReason: {}\n({})".format(error_reason, os.path.basename(image_data['path']))
                     self.image_display_label.setText(fail_msg)
                     self.image_display_label.setStyleSheet("border: 1px solid #BF616A; color: #BF616A; font-weight: bold;")
@@ -2828,6 +5743,8 @@ start "" /d "%APP_DIR%\\.." "%APP_DIR%\\..\\%APP_EXE_TO_KILL%"
                     label_size = self.image_display_label.size()
                     if label_size.width() > 0 and label_size.height() > 0:
                         if not self.image_display_label.pixmap() or self.is_image_zoomed is False:
+                            # Cached images are already fitted to this label size, so this scale is only a safety net.
+                            self.display_pixmap_index = current_preview
                             if original_pixmap.width() > label_size.width() or original_pixmap.height() > label_size.height():
                                 scaled_pixmap = original_pixmap.scaled(label_size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
                             else:
@@ -2838,7 +5755,7 @@ start "" /d "%APP_DIR%\\.." "%APP_DIR%\\..\\%APP_EXE_TO_KILL%"
                 full_text_str = ""
                 if is_search_active:
                     current_match_num = self.current_search_index + 1
-                    full_text_str = "{} Match {} of {}: {}".format(base_info_str, current_match_num, len(self.search_results), image_data['filename'])
+                    full_text_str = "{} Match {} of {}: {}".format(base_info_str, current_match_num, self._search_results_count_text(), image_data['filename'])
                 else:
                     full_text_str = "{} {}".format(base_info_str, image_data['filename'])
 
@@ -2849,6 +5766,8 @@ start "" /d "%APP_DIR%\\.." "%APP_DIR%\\..\\%APP_EXE_TO_KILL%"
                 fmt = image_data.get('format', 'N/A')
                 size_bytes = image_data.get('size', 0)
                 formatted_size = self._format_file_size(size_bytes)
+                if image_data.get('unpacked_size'):
+                    formatted_size += " ({} unpacked)".format(self._format_file_size(image_data['unpacked_size']))
                 self.image_details_label.setText("Dimensions: {} | Format: {} | Size: {}".format(dims, fmt, formatted_size))
 
                 self.btn_first.setEnabled(current_preview > 0)
@@ -2863,7 +5782,7 @@ start "" /d "%APP_DIR%\\.." "%APP_DIR%\\..\\%APP_EXE_TO_KILL%"
                     self.export_filtered_action.setEnabled(is_search_active)
                     self.export_all_action.setText("Export All ({} items)...".format(total_previews))
                     if is_search_active:
-                        self.export_filtered_action.setText("Export Filtered ({} items)...".format(len(self.search_results)))
+                        self.export_filtered_action.setText("Export Filtered ({} items)...".format(self._search_results_count_text()))
                     else:
                         self.export_filtered_action.setText("Export Filtered...")
                     self.export_selected_action.setText("Export Selected (1 item)...")
@@ -2877,6 +5796,8 @@ start "" /d "%APP_DIR%\\.." "%APP_DIR%\\..\\%APP_EXE_TO_KILL%"
                     self.btn_find_prev.setEnabled(is_search_active)
                     self.btn_find_next.setEnabled(is_search_active)
 
+                self._prefetch_neighbours(current_preview)
+
             if has_ui:
                 self.image_nav_slider.blockSignals(False)
 
@@ -2932,6 +5853,7 @@ start "" /d "%APP_DIR%\\.." "%APP_DIR%\\..\\%APP_EXE_TO_KILL%"
         self.status_label.setText(status_text)
     def _on_get_info_extract_failed(self, error_message):
         """Handles failure during the silent extraction phase of Get Info."""
+        self.gallery_stream_timer.stop()
         self._log_message(f"[ERROR] Failed during silent extraction phase: {error_message}")
         self.status_label.setText("Error caching images.")
         self.progress_bar.setRange(0, 100)
@@ -2962,15 +5884,15 @@ start "" /d "%APP_DIR%\\.." "%APP_DIR%\\..\\%APP_EXE_TO_KILL%"
             command = [exe_path, "-info", os.path.normpath(self.decompile_input_file)]
 
             self.info_thread = QThread(self)
-            self.info_worker = Worker(command, process_cwd, show_window=False)
+            self.info_worker = Worker(command, process_cwd, show_window=False, info_cache_dir=self.info_cache_dir)
             self.info_worker.moveToThread(self.info_thread)
 
             # Clear buffers again to be safe
             self.preview_images.clear()
             self.log_message_buffer.clear()
 
-            self.info_worker.progress_updated.connect(self._on_info_progress_updated)
-            self.info_worker.info_line_parsed.connect(self._on_info_line_received)
+            self.info_worker.info_batch_ready.connect(self._on_info_batch_received)
+            self.info_worker.info_sizes_scanned.connect(self._on_info_sizes_scanned)
 
             self.info_worker.finished.connect(self.info_thread.quit)
             self.info_worker.finished.connect(self.info_worker.deleteLater)
@@ -2988,6 +5910,239 @@ start "" /d "%APP_DIR%\\.." "%APP_DIR%\\..\\%APP_EXE_TO_KILL%"
         '''Handles progress updates specifically for the Phase 1 caching process.'''
         self.progress_bar.setValue(percentage)
         self.status_label.setText(f"Step 1/2: {message}")
+    def _on_native_info_progress(self, percentage, message):
+        '''Handles progress updates from the native directory reader.'''
+        self.progress_bar.setValue(percentage)
+        status_text = f"Reading texture directory... {message}"
+        if len(status_text) > 80:
+            status_text = f"Reading texture directory... ...{message[-47:]}"
+        self.status_label.setText(status_text)
+    def _on_native_records_streamed(self, reader, batch):
+        '''Appends a batch of rows from XbtInfoWorker; the gallery picks them up on the next stream tick.'''
+        if self.xbt_reader is not reader:
+            self.xbt_reader = reader # The previous reader was closed when Get Info started
+        self.preview_images.extend_table(batch)
+    def _on_gallery_rows_streamed(self):
+        '''Shows rows that arrived since the last tick: one batched model insert, a longer slider and the first texture as soon as it is known.'''
+        if len(self.preview_images) <= self.thumbnail_model.rowCount():
+            return
+        self.thumbnail_model.append_rows(self.preview_images)
+        if self.current_preview_index == -1:
+            self.current_preview_index = 0
+        self._update_previewer_ui()
+    def _on_native_info_finished(self, reader, records, from_index, entry_key):
+        '''Receives the parsed directory from XbtInfoWorker and hands off to the common completion path.'''
+        if self.xbt_reader is not reader:
+            self._close_xbt_reader()
+            self.xbt_reader = reader
+        self.metadata_entry_key = entry_key
+        self.preview_images = records
+        self.log_message_buffer.clear()
+
+        for record in records:
+            self.log_message_buffer.append("[DATA] Texture: {} | Dimensions: {} | Format: {} | Size: {} ({} unpacked)".format(
+                record['filename'], record['dimensions'], record['format'],
+                self._format_file_size(record['packed_size']), self._format_file_size(record['unpacked_size'])))
+
+        if from_index:
+            self._log_message("[INFO] Loaded {} texture records from the metadata index (file unchanged since last scan).".format(len(records)))
+        else:
+            self._log_message("[INFO] Read {} textures from the XBT directory in a single pass.".format(len(records)))
+        self._on_process_finished("decompile_info", 0, "")
+    def _on_native_info_failed(self, error_message):
+        '''Falls back to the TextureExtractor/TextureCompiler pipeline when the native reader cannot open the file.'''
+        self.info_thread, self.info_worker = None, None
+        if self.xbt_reader is not None or self.preview_images:
+            # Drop anything streamed before the failure; the fallback rebuilds the gallery from scratch.
+            self.preview_images.clear()
+            self.current_preview_index = -1
+            self._close_xbt_reader()
+            self._update_previewer_ui()
+        self._log_message(f"[WARN] Native XBT reader unavailable for this file: {error_message}")
+        self._log_message("[INFO] Falling back to the two-stage extract and info scan.")
+        self._start_get_info_phase1()
+    def _is_native_record(self, image_data):
+        '''True if the record can be decoded from the open XBT reader instead of an image file.'''
+        return self.xbt_reader is not None and image_data.get('texture_index', -1) >= 0
+    def _request_frame_decode(self, preview_index, image_data, priority=0):
+        '''Queues a decode of a record on the decode pool, unless one is already in flight for it.'''
+        task = self.pending_decodes.get(preview_index)
+        if task is not None:
+            # Promote a queued prefetch to the front when the user lands on it.
+            if priority > 0 and self.decode_pool.tryTake(task):
+                self.decode_pool.start(task, priority)
+            return
+        self.decode_request_id += 1
+        if self._is_native_record(image_data):
+            task = FrameDecodeTask(self.decode_request_id, preview_index, frame=self.xbt_reader[image_data['texture_index']].frames[0],
+                                   display_size=self.image_display_label.size())
+        else:
+            task = FrameDecodeTask(self.decode_request_id, preview_index, path=image_data['path'], display_size=self.image_display_label.size())
+        task.signals.decoded.connect(self._on_frame_decoded)
+        task.signals.failed.connect(self._on_frame_decode_failed)
+        self.pending_decodes[preview_index] = task
+        self.decode_pool.start(task, priority)
+    def _cancel_stale_decodes(self, wanted_indexes):
+        '''Drops queued decodes the user has scrolled away from. Ones already running finish into the cache.'''
+        for preview_index, task in list(self.pending_decodes.items()):
+            if preview_index not in wanted_indexes and self.decode_pool.tryTake(task):
+                del self.pending_decodes[preview_index]
+    def _prefetch_window(self, preview_index):
+        '''The indexes the prefetcher warms next, in the current navigation direction.'''
+        indexes = (preview_index + step * self.nav_direction for step in range(1, self.preview_prefetch_count + 1))
+        return [index for index in indexes if 0 <= index < len(self.preview_images)]
+    def _prefetch_neighbours(self, preview_index):
+        '''Warms the decoded-image cache with the next few textures in the current navigation direction.'''
+        for index in self._prefetch_window(preview_index):
+            if self._display_cache_key(index) in self.image_cache or index in self.decode_errors:
+                continue
+            image_data = self.preview_images[index]
+            if self._is_native_record(image_data) or os.path.exists(image_data['path']):
+                self._request_frame_decode(index, image_data)
+    def _finish_decode_request(self, request_id, preview_index):
+        '''Clears the pending entry for a finished request. Returns False if the result is stale and must be dropped.'''
+        if request_id <= self.stale_request_id:
+            return False
+        task = self.pending_decodes.get(preview_index)
+        if task is not None and task.request_id == request_id:
+            del self.pending_decodes[preview_index]
+        return True
+    def _display_cache_key(self, preview_index):
+        '''image_cache key of a preview fitted to the current label size; a resize makes every entry miss and re-fit.'''
+        label_size = self.image_display_label.size()
+        return preview_index, label_size.width(), label_size.height()
+    def _on_frame_decoded(self, request_id, preview_index, image, thumbnail, source_size, display_size):
+        '''Caches a decoded image and shows it if the user is still on it. Results from a previous gallery are dropped.'''
+        if not self._finish_decode_request(request_id, preview_index):
+            return
+        self.image_cache.put((preview_index, display_size.width(), display_size.height()), image)
+        self.thumbnail_cache.put(preview_index, thumbnail)
+        if preview_index == self.current_preview_index:
+            # Lazy update of dimensions if missing
+            image_data = self.preview_images[preview_index]
+            if image_data.get('dimensions') == 'N/A' or not image_data.get('dimensions'):
+                image_data['dimensions'] = "{}x{}".format(source_size.width(), source_size.height())
+            self._update_previewer_ui()
+    def _on_frame_decode_failed(self, request_id, preview_index, error_message):
+        if not self._finish_decode_request(request_id, preview_index):
+            return
+        self.decode_errors[preview_index] = error_message
+        if preview_index == self.current_preview_index:
+            self._update_previewer_ui()
+    def _invalidate_gallery_caches(self):
+        '''Forgets decoded images, thumbnails and the search index of the gallery; work still in flight is ignored when it finishes.'''
+        self.search_index = None
+        self.search_index_generation += 1
+        for task in self.pending_decodes.values():
+            self.decode_pool.tryTake(task)
+        self.stale_request_id = self.decode_request_id
+        self.pending_decodes.clear()
+        self.decode_errors.clear()
+        self.image_cache.clear()
+        self.display_pixmap_index = -1
+        self.thumbnail_cache.clear()
+        for task in self.pending_thumbnails.values():
+            self.thumbnail_pool.tryTake(task)
+        self.pending_thumbnails.clear()
+        self._flush_thumbnail_writes()
+        if hasattr(self, 'thumbnail_model'):
+            self.thumbnail_model.reset([])
+    def _request_thumbnail(self, row):
+        '''Queues a grid thumbnail for a row the view is painting. Newer requests run first, so the cells the user stopped on win.'''
+        if row in self.pending_thumbnails or row >= len(self.preview_images):
+            return
+        image_data = self.preview_images[row]
+        self.decode_request_id += 1
+        if self._is_native_record(image_data):
+            task = ThumbnailTask(self.decode_request_id, row, frame=self.xbt_reader[image_data['texture_index']].frames[0],
+                                 metadata_index=self.metadata_index, entry_key=self.metadata_entry_key,
+                                 texture_index=image_data['texture_index'])
+        else:
+            task = ThumbnailTask(self.decode_request_id, row, path=image_data['path'])
+        task.signals.ready.connect(self._on_thumbnail_ready)
+        task.signals.failed.connect(self._on_thumbnail_failed)
+        self.pending_thumbnails[row] = task
+        self.thumbnail_pool.start(task, self.decode_request_id & 0x7FFFFFFF)
+    def _cancel_offscreen_thumbnails(self):
+        '''Drops queued thumbnail tasks whose cells are no longer (nearly) visible.'''
+        viewport_rect = self.thumbnail_grid_view.viewport().rect()
+        margin = self.thumbnail_grid_view.gridSize().height()
+        visible_rect = viewport_rect.adjusted(0, -margin, 0, margin)
+        for row, task in list(self.pending_thumbnails.items()):
+            cell_rect = self.thumbnail_grid_view.visualRect(self.thumbnail_model.index(row))
+            if not cell_rect.intersects(visible_rect) and self.thumbnail_pool.tryTake(task):
+                del self.pending_thumbnails[row]
+    def _finish_thumbnail_request(self, request_id, row):
+        if request_id <= self.stale_request_id:
+            return False
+        task = self.pending_thumbnails.get(row)
+        if task is not None and task.request_id == request_id:
+            del self.pending_thumbnails[row]
+        return True
+    def _on_thumbnail_ready(self, request_id, row, thumbnail, png_bytes):
+        if not self._finish_thumbnail_request(request_id, row):
+            return
+        self.thumbnail_cache.put(row, thumbnail)
+        if png_bytes and self.metadata_entry_key:
+            self.thumbnail_write_queue.append((self.metadata_entry_key, self.preview_images[row]['texture_index'], png_bytes))
+            if not self.thumbnail_flush_timer.isActive():
+                self.thumbnail_flush_timer.start()
+        self.thumbnail_model.thumbnail_ready(row)
+    def _on_thumbnail_failed(self, request_id, row, error_message):
+        if not self._finish_thumbnail_request(request_id, row):
+            return
+        self.thumbnail_model.failed_rows.add(row)
+    def _flush_thumbnail_writes(self):
+        '''Writes queued grid thumbnails to the metadata index in one transaction on the global thread pool, one batch at a time.'''
+        if not self.thumbnail_write_queue:
+            return
+        if self.thumbnail_write_task is not None:
+            # The previous batch is still being written; try again on the next tick.
+            if not self.thumbnail_flush_timer.isActive():
+                self.thumbnail_flush_timer.start()
+            return
+        items, self.thumbnail_write_queue = self.thumbnail_write_queue, []
+        self.thumbnail_write_task = ThumbnailWriteTask(self.metadata_index, items)
+        self.thumbnail_write_task.setAutoDelete(False)
+        self.thumbnail_write_task.signals.finished.connect(self._on_thumbnail_write_finished)
+        QThreadPool.globalInstance().start(self.thumbnail_write_task)
+    def _on_thumbnail_write_finished(self):
+        self.thumbnail_write_task = None
+    def _toggle_grid_view(self, checked):
+        '''Switches the previewer between the single image and the thumbnail grid.'''
+        self.preview_view_stack.setCurrentIndex(1 if checked else 0)
+        if checked:
+            if self.thumbnail_model.rowCount() != len(self.preview_images):
+                self.thumbnail_model.reset(self.preview_images)
+            if self.current_preview_index != -1:
+                index = self.thumbnail_model.index(self.current_preview_index)
+                self.thumbnail_grid_view.setCurrentIndex(index)
+                self.thumbnail_grid_view.scrollTo(index, QListView.ScrollHint.PositionAtCenter)
+        else:
+            self._update_previewer_ui()
+    def _on_grid_item_clicked(self, index):
+        self._reset_search_state()
+        self.current_preview_index = index.row()
+        self._update_previewer_ui()
+    def _on_grid_item_activated(self, index):
+        '''Opens the activated cell in the single image view.'''
+        self._reset_search_state()
+        self.current_preview_index = index.row()
+        self.btn_grid_view.setChecked(False)
+    def _close_xbt_reader(self):
+        '''Releases the memory-mapped XBT file used by the previewer, if any.'''
+        self._invalidate_gallery_caches()
+        self.metadata_entry_key = ""
+        if self.xbt_reader is not None:
+            self.xbt_reader.close()
+            self.xbt_reader = None
+    def _ensure_preview_file(self, image_data):
+        '''Decodes a native record to the info cache on first use. Returns True if the image file exists.'''
+        try:
+            return ensure_xbt_record_file(self.xbt_reader, image_data)
+        except Exception as e:
+            self._log_message("[WARN] Could not decode '{}': {}".format(image_data.get('filename', ''), e))
+            return False
     def _on_pdf_export_finished(self, result_message, pdf_path=None):
         """Handles the completion or failure of the PDF export background task."""
         if pdf_path:
@@ -3008,10 +6163,11 @@ start "" /d "%APP_DIR%\\.." "%APP_DIR%\\..\\%APP_EXE_TO_KILL%"
         finished = Signal(str)
         error = Signal(str)
 
-        def __init__(self, info_data, output_path):
+        def __init__(self, info_data, output_path, xbt_reader=None):
             super().__init__()
             self.info_data = info_data
             self.output_path = output_path
+            self.xbt_reader = xbt_reader
         def run(self):
             try:
                 from reportlab.pdfgen import canvas
@@ -3021,25 +6177,23 @@ start "" /d "%APP_DIR%\\.." "%APP_DIR%\\..\\%APP_EXE_TO_KILL%"
                 from reportlab.lib import colors
                 from datetime import datetime
                 import gc
-                from PySide6.QtGui import QImageReader
             except ImportError:
                 self.error.emit("ERROR: reportlab library not found. Please install it using 'pip install reportlab'.")
                 return
+            try:
+                from PIL import Image # Normally installed with reportlab
+            except ImportError as e:
+                self.error.emit(f"ERROR: Pillow library not found or broken ({e}). Please install it using 'pip install pillow'.")
+                return
 
             # Pre-scan and populate missing dimension data to prevent UI freezes.
             # This is necessary because dimensions are often lazy-loaded in the UI.
-            for item_data in self.info_data:
-                if item_data.get('dimensions') == 'N/A' or not item_data.get('dimensions'):
-                    try:
-                        # Use QImageReader as it's robust and matches the main app's logic.
-                        reader = QImageReader(item_data['path'])
-                        reader.setAllocationLimit(0) # Match main app setting
-                        if reader.canRead():
-                            size = reader.size()
-                            item_data['dimensions'] = "{}x{}".format(size.width(), size.height())
-                    except Exception:
-                        # If reading fails, it remains 'N/A'.
-                        pass
+            # Only image headers are read, on a thread pool; unreadable files stay 'N/A'.
+            missing = [item_data for item_data in self.info_data
+                       if item_data.get('dimensions') == 'N/A' or not item_data.get('dimensions')]
+            for item_data, (width, height, _) in zip(missing, probe_image_headers([item_data['path'] for item_data in missing])):
+                if width and height:
+                    item_data['dimensions'] = "{}x{}".format(width, height)
 
             # --- Color & Font Definitions (Nord Theme Inspired) ---
             COLOR_HEADER_BG = colors.HexColor('#434c5e')
@@ -3159,7 +6313,13 @@ start "" /d "%APP_DIR%\\.." "%APP_DIR%\\..\\%APP_EXE_TO_KILL%"
                     c.rect(img_x, img_y, img_w, img_h, fill=1, stroke=1)
 
                     try:
-                        img_reader = ImageReader(data['path'])
+                        if self.xbt_reader is not None and data.get('texture_index', -1) >= 0:
+                            # Native records are decoded in memory from the mapped .xbt, not via the info cache.
+                            decoded = next(iter_xbt_frames(self.xbt_reader, [data['texture_index']]))
+                            img_reader = ImageReader(Image.frombuffer("RGBA", (decoded.width, decoded.height), decoded.buffer, "raw", "BGRA", 0, 1))
+                            del decoded
+                        else:
+                            img_reader = ImageReader(data['path'])
                         c.drawImage(img_reader, img_x, img_y, width=img_w, height=img_h, preserveAspectRatio=True, anchor='c', mask='auto')
                         del img_reader
                     except Exception:
@@ -3236,6 +6396,7 @@ start "" /d "%APP_DIR%\\.." "%APP_DIR%\\..\\%APP_EXE_TO_KILL%"
         self.decompile_output_label.style().polish(self.decompile_output_label)
         self.preview_images.clear()
         self.current_preview_index = -1
+        self._close_xbt_reader()
         # Also reset search state when clearing
         self._reset_search_state()
         self._populate_dimensions_filter()
@@ -3263,7 +6424,7 @@ start "" /d "%APP_DIR%\\.." "%APP_DIR%\\..\\%APP_EXE_TO_KILL%"
         '''Opens the currently displayed image in the system's default viewer.'''
         if self.preview_images and self.current_preview_index != -1:
             image_path = self.preview_images[self.current_preview_index]['path']
-            if os.path.exists(image_path):
+            if self._ensure_preview_file(self.preview_images[self.current_preview_index]):
                 self._log_message(f"[INFO] Opening image in default viewer: {os.path.basename(image_path)}")
                 if sys.platform == "win32":
                     os.startfile(os.path.normpath(image_path))
@@ -3298,12 +6459,19 @@ start "" /d "%APP_DIR%\\.." "%APP_DIR%\\..\\%APP_EXE_TO_KILL%"
         """Clears the search query, results, and resets UI state."""
         self.last_search_query = ("", "")
         self.search_results.clear()
+        self.search_results_complete = True
         self.current_search_index = -1
         if hasattr(self, 'image_jump_to_edit'):
             self.image_jump_to_edit.clear()
             self.image_jump_to_edit.setStyleSheet("")
         if hasattr(self, 'dimensions_filter_combo'):
             self.dimensions_filter_combo.setCurrentIndex(0)
+        if hasattr(self, 'facet_filter_combo'):
+            self.facet_filter_combo.setCurrentIndex(0)
+
+        if hasattr(self, 'search_match_label'):
+            self.search_jump_timer.stop()
+            self.search_match_label.setText("")
 
         # Explicitly disable find buttons when search is reset
         if hasattr(self, 'btn_find_prev'):
@@ -3312,6 +6480,32 @@ start "" /d "%APP_DIR%\\.." "%APP_DIR%\\..\\%APP_EXE_TO_KILL%"
 
         if hasattr(self, 'image_info_label'):
                 self._update_previewer_ui()
+    def _start_search_index_build(self):
+        '''Builds the trigram search index for the loaded gallery on the global thread pool.'''
+        self.search_index_generation += 1
+        if not self.preview_images:
+            self.search_index = None
+            return
+        names = list(self.preview_images.names())
+        if self.search_index is not None and self.search_index.names != [name.lower() for name in names]:
+            # Keep the index extended while rows streamed in until the full one is built, unless the rows changed since.
+            self.search_index = None
+        self.search_index_task = SearchIndexTask(self.search_index_generation, names)
+        self.search_index_task.setAutoDelete(False)
+        self.search_index_task.signals.built.connect(self._on_search_index_built)
+        QThreadPool.globalInstance().start(self.search_index_task)
+    def _on_search_index_built(self, generation, search_index):
+        if generation == self.search_index_generation:
+            self.search_index = search_index
+        self.search_index_task = None
+    def _get_search_index(self):
+        '''Returns the search index, building a postings-free one on the spot if the background build hasn't finished.'''
+        if self.search_index is None or len(self.search_index.names) > len(self.preview_images):
+            self.search_index = TextureSearchIndex(self.preview_images.names(), build_postings=False)
+        elif len(self.search_index.names) < len(self.preview_images):
+            # Get Info is still streaming rows in; only the new ones are added.
+            self.search_index.extend(self.preview_images.names(len(self.search_index.names)))
+        return self.search_index
     def _perform_search(self):
         """
 Populates the search_results list, updates find button states, and returns True if results were found.
@@ -3322,20 +6516,8 @@ Populates the search_results list, updates find button states, and returns True
                 self.btn_find_next.setEnabled(False)
             return False
 
-        query = ""
-        criterion = self.search_criteria_combo.currentText()
-        active_search_widget = self.image_jump_to_edit
-        is_valid_query = True
-
-        if criterion == "Dimensions":
-            query = self.dimensions_filter_combo.currentText()
-            active_search_widget = self.dimensions_filter_combo
-            if self.dimensions_filter_combo.currentIndex() <= 0:
-                is_valid_query = False
-        else:
-            query = self.image_jump_to_edit.text().strip()
-            if not query:
-                is_valid_query = False
+        query, criterion, active_search_widget = self._current_search_query()
+        is_valid_query = bool(query)
 
         if not is_valid_query:
             self._reset_search_state()
@@ -3345,6 +6527,7 @@ Populates the search_results list, updates find button states, and returns True
         if current_search_tuple != self.last_search_query:
             self.last_search_query = current_search_tuple
             self.search_results.clear()
+            self.search_results_complete = True
             self.current_search_index = -1
 
             if criterion == "Index":
@@ -3354,24 +6537,35 @@ Populates the search_results list, updates find button states, and returns True
                         self.search_results.append(num_index)
                 except (ValueError, TypeError): pass
             elif criterion == "Dimensions":
-                query_lower = query.lower()
-                for i, image_data in enumerate(self.preview_images):
-                    if query_lower == image_data.get('dimensions', 'N/A').lower():
-                        self.search_results.append(i)
-            else: # Filename
-                query_lower = query.lower()
-                for i, image_data in enumerate(self.preview_images):
-                    if query_lower in image_data['filename'].lower():
-                        self.search_results.append(i)
+                self.search_results.extend(self.preview_images.rows_with_dimensions(query))
+            elif criterion == "Format":
+                self.search_results.extend(self.preview_images.rows_with_format(query))
+            elif criterion in self.FACET_CRITERIA: # Size and Folder entries carry a TextureQuery
+                self.search_results.extend(TextureQuery(query).filter(self.preview_images, self._get_search_index()))
+            elif criterion == "Query":
+                try:
+                    self.search_results.extend(TextureQuery(query).filter(self.preview_images, self._get_search_index()))
+                except (ValueError, re.error):
+                    pass # Incomplete or invalid terms simply have no matches yet
+            else: # Filename: substring, ^prefix, glob or /regex/
+                try:
+                    # Broad queries match most of the gallery; only the first page is verified now.
+                    rows = self._get_search_index().search(query, limit=self.SEARCH_PAGE_ROWS + 1)
+                    self.search_results_complete = len(rows) <= self.SEARCH_PAGE_ROWS
+                    self.search_results.extend(rows[:self.SEARCH_PAGE_ROWS])
+                except re.error:
+                    pass # An incomplete regular expression simply has no matches yet
 
         if self.search_results:
             active_search_widget.setStyleSheet("")
             self.btn_find_prev.setEnabled(True)
             self.btn_find_next.setEnabled(True)
+            self._update_search_match_label()
             return True
         else:
             self.search_results.clear()
             self.current_search_index = -1
+            self.search_match_label.setText("No matches")
             if isinstance(active_search_widget, QLineEdit):
                 active_search_widget.setStyleSheet("background-color: #BF616A;")
 
@@ -3379,15 +6573,66 @@ Populates the search_results list, updates find button states, and returns True
             self.btn_find_next.setEnabled(False)
             return False
     
+    def _search_results_count_text(self):
+        """The number of search results for display, with a '+' while a paged search has more to load."""
+        return "{:,}{}".format(len(self.search_results), "" if self.search_results_complete else "+")
+    def _update_search_match_label(self):
+        """Shows the match count next to the search box."""
+        if len(self.search_results) == 1 and self.search_results_complete:
+            self.search_match_label.setText("1 match")
+        else:
+            self.search_match_label.setText("{} matches".format(self._search_results_count_text()))
+    def _load_more_search_results(self, all_rows=False):
+        """Fetches the next page of a paged filename search, or every remaining match. Returns True if rows were added."""
+        if self.search_results_complete or not self.search_results:
+            return False
+        rows = self._get_search_index().search(self.last_search_query[0], limit=None if all_rows else self.SEARCH_PAGE_ROWS + 1,
+                                               after=self.search_results[-1])
+        self.search_results_complete = all_rows or len(rows) <= self.SEARCH_PAGE_ROWS
+        self.search_results.extend(rows if all_rows else rows[:self.SEARCH_PAGE_ROWS])
+        self._update_search_match_label()
+        return bool(rows)
+    def _current_search_query(self):
+        """Returns (query, criterion, input widget) for the selected search criterion; the query is empty if nothing is chosen."""
+        criterion = self.search_criteria_combo.currentText()
+        if criterion == "Dimensions":
+            combo = self.dimensions_filter_combo
+        elif criterion in self.FACET_CRITERIA:
+            combo = self.facet_filter_combo
+        else:
+            return self.image_jump_to_edit.text().strip(), criterion, self.image_jump_to_edit
+        return (combo.currentData() or "") if combo.currentIndex() > 0 else "", criterion, combo
+    def _on_search_text_changed(self, text):
+        """Restarts the debounce timer; a search still waiting on it is cancelled and no image is decoded while typing."""
+        self.search_jump_timer.stop()
+        self.search_debounce_timer.start()
+    def _run_debounced_search(self):
+        """Runs the search once typing pauses and updates the live match count. The jump (and decode) waits a little longer."""
+        if not self.image_jump_to_edit.text().strip():
+            if self.search_results or self.last_search_query != ("", ""):
+                self._reset_search_state()
+            return
+        if self._perform_search():
+            self.search_jump_timer.start()
+    def _jump_to_first_debounced_match(self):
+        """Shows the first match once the query has settled, so only the final result is decoded."""
+        if self.search_results:
+            self.current_search_index = 0
+            self._jump_to_search_result()
+    def _cancel_pending_search(self):
+        """Stops the debounce timers when the user navigates explicitly."""
+        self.search_debounce_timer.stop()
+        self.search_jump_timer.stop()
     def _find_first_match(self):
         """Triggered by Enter key. Finds results and jumps to the first one."""
+        self._cancel_pending_search()
         if self._perform_search():
             self.current_search_index = 0
             self._jump_to_search_result()
     def _find_next_match(self):
         """Jumps to the next item in the search results, wrapping around."""
-        query = self.image_jump_to_edit.text().strip()
-        criterion = self.search_criteria_combo.currentText()
+        self._cancel_pending_search()
+        query, criterion, _ = self._current_search_query()
         current_search_tuple = (query, criterion)
 
         # If no active search, or if query/criterion changed, perform one first.
@@ -3399,12 +6644,14 @@ Populates the search_results list, updates find button states, and returns True
 
         if not self.search_results: return # Guard against no results
 
+        if self.current_search_index + 1 == len(self.search_results):
+            self._load_more_search_results()
         self.current_search_index = (self.current_search_index + 1) % len(self.search_results)
         self._jump_to_search_result()
     def _find_previous_match(self):
         """Jumps to the previous item in the search results, wrapping around."""
-        query = self.image_jump_to_edit.text().strip()
-        criterion = self.search_criteria_combo.currentText()
+        self._cancel_pending_search()
+        query, criterion, _ = self._current_search_query()
         current_search_tuple = (query, criterion)
 
         # If no active search, or if query/criterion changed, perform one first.
@@ -3417,6 +6664,9 @@ Populates the search_results list, updates find button states, and returns True
 
         if not self.search_results: return # Guard against no results
 
+        if self.current_search_index == 0:
+            # Wrapping around to the last match needs every match loaded.
+            self._load_more_search_results(all_rows=True)
         self.current_search_index = (self.current_search_index - 1 + len(self.search_results)) % len(self.search_results)
         self._jump_to_search_result()
     
@@ -3442,43 +6692,20 @@ Populates the search_results list, updates find button states, and returns True
         self._save_settings()
         status = 'Enabled' if self.open_compile_on_complete else 'Disabled'
         self._log_message(f"[INFO] Setting 'Open Compile Folder on Completion' is now {status}.")
-    def _on_info_line_received(self, raw_line, filename):
+    def _on_info_batch_received(self, batch):
         '''
-A lightweight slot that buffers raw data from the worker and updates the
-previewer data structure in near real-time.
+Receives an InfoRecordBatch parsed by the Worker. No filesystem access here:
+sizes arrive in one batch from the Worker's directory scan when the process ends.
 '''
-        # Add the raw message, prefixed for correct formatting, to the log buffer.
         # The actual logging to GUI/file is handled by the batched processor.
-        self.log_message_buffer.append(f"[DATA] {raw_line}")
-
-        if filename and self.info_cache_dir:
-            # This is a 'Texture:' line, which starts a new record.
-            image_path = os.path.join(self.info_cache_dir, filename)
-            new_record = {'path': image_path, 'filename': filename, 'dimensions': 'N/A', 'format': 'N/A', 'size': 0}
-
-            # --- UPGRADE: Get and store file size ---
-            if os.path.exists(image_path):
-                try:
-                    new_record['size'] = os.path.getsize(image_path)
-                except OSError:
-                    pass # Keep size as 0 on error
-
-            self.preview_images.append(new_record)
-
-        elif self.preview_images:
-            # This is a detail line (e.g., "Dimensions:"), add it to the last record.
-            if "Dimensions:" in raw_line:
-                try:
-                    dims = raw_line.split("Dimensions:", 1)[1].strip()
-                    self.preview_images[-1]['dimensions'] = dims
-                except IndexError:
-                    pass
-            elif "Format:" in raw_line:
-                try:
-                    fmt = raw_line.split("Format:", 1)[1].strip()
-                    self.preview_images[-1]['format'] = fmt
-                except IndexError:
-                    pass
+        self.log_message_buffer.extend(f"[DATA] {raw_line}" for raw_line in batch.lines)
+        self.preview_images.extend_table(batch.records)
+        if batch.progress >= 0:
+            self._on_info_progress_updated(batch.progress, batch.message)
+    def _on_info_sizes_scanned(self, sizes):
+        '''Fills in the file sizes of the records once the image cache is complete.'''
+        if len(sizes) == len(self.preview_images):
+            self.preview_images.set_sizes(sizes)
     def _process_log_message_buffer(self):
         """
 Processes the entire log buffer in a single, efficient operation to prevent UI freezes and race conditions.
@@ -3597,32 +6824,61 @@ Processes the entire log buffer in a single, efficient operation to prevent UI f
         criterion = self.search_criteria_combo.itemText(index)
         if criterion == "Dimensions":
             self.search_input_stack.setCurrentWidget(self.dimensions_filter_combo)
+        elif criterion in self.FACET_CRITERIA:
+            self._populate_facet_filter()
+            self.search_input_stack.setCurrentWidget(self.facet_filter_combo)
         else:
             self.search_input_stack.setCurrentWidget(self.image_jump_to_edit)
+            self.image_jump_to_edit.setPlaceholderText("e.g. name:*button* w>=512 fmt:DXT5 size>200KB" if criterion == "Query" else "")
         self._reset_search_state()
     
     def _populate_dimensions_filter(self):
-        """Populates the dimensions combo box with unique dimensions from the image data."""
+        """Populates the dimensions combo box, with counts, from the gallery's cached facets."""
         self.dimensions_filter_combo.blockSignals(True)
         self.dimensions_filter_combo.clear()
         self.dimensions_filter_combo.addItem("-- Filter by Dimensions --")
 
         if self.preview_images:
-            all_dims = [img.get('dimensions', 'N/A') for img in self.preview_images]
+            counts = self.preview_images.facets()['dimensions']
             def sort_key(dim_str):
-                try:
-                    width, height = map(int, dim_str.split('x'))
-                    return (width, height)
-                except (ValueError, AttributeError):
-                    return (99999, 99999)
+                width, height = parse_dimensions(dim_str)
+                return (width or 99999, height or 99999, dim_str)
 
-            unique_dims = sorted(list(set(d for d in all_dims if d != 'N/A')), key=sort_key)
-            self.dimensions_filter_combo.addItems(unique_dims)
+            for dims in sorted((d for d in counts if d != 'N/A'), key=sort_key):
+                self.dimensions_filter_combo.addItem(f"{dims} ({counts[dims]:,})", dims)
             self.dimensions_filter_combo.setEnabled(True)
         else:
             self.dimensions_filter_combo.setEnabled(False)
 
         self.dimensions_filter_combo.blockSignals(False)
+        self._populate_facet_filter()
+    def _populate_facet_filter(self):
+        """Fills the facet combo for the selected Format, Size or Folder criterion from the cached facet counts."""
+        criterion = self.search_criteria_combo.currentText()
+        facet = self.FACET_CRITERIA.get(criterion)
+        combo = self.facet_filter_combo
+        combo.blockSignals(True)
+        combo.clear()
+        combo.addItem(f"-- Filter by {criterion} --" if facet else "--")
+        counts = self.preview_images.facets()[facet] if facet and self.preview_images else {}
+        if facet == "size":
+            for bucket in sorted(counts, key=int):
+                low, high = TextureTable.size_bucket_range(int(bucket))
+                if high is None:
+                    label, query = f">= {self._format_file_size(low)}", f"size>={low}"
+                elif not low:
+                    label, query = f"< {self._format_file_size(high)}", f"size<{high}"
+                else:
+                    label, query = f"{self._format_file_size(low)} - {self._format_file_size(high)}", f"size>={low} size<{high}"
+                combo.addItem(f"{label} ({counts[bucket]:,})", query)
+        elif facet == "directory":
+            for prefix in sorted(counts, key=str.lower):
+                combo.addItem(f"{prefix} ({counts[prefix]:,})", f'name:"^{prefix}"')
+        else:
+            for format_name in sorted(counts):
+                combo.addItem(f"{format_name} ({counts[format_name]:,})", format_name)
+        combo.setEnabled(bool(counts))
+        combo.blockSignals(False)
     def _toggle_open_pdf_on_complete(self):
         """Handles the 'Open PDF Report on Completion' menu action."""
         self.open_pdf_on_complete = self.open_pdf_on_complete_action.isChecked()
@@ -3647,6 +6903,7 @@ Processes the entire log buffer in a single, efficient operation to prevent UI f
         """Clears the image previewer gallery and resets its state."""
         self.preview_images.clear()
         self.current_preview_index = -1
+        self._close_xbt_reader()
         self._reset_search_state()
         self._populate_dimensions_filter()
         self._update_previewer_ui()
@@ -3841,6 +7098,10 @@ Processes the entire log buffer in a single, efficient operation to prevent UI f
         '''Handles the toggling of the dupecheck checkbox.'''
         status = "enabled" if checked else "disabled"
         self._log_message(f"[INFO] Dupecheck has been {status}.")
+    def _on_incremental_toggled(self, checked):
+        '''Handles the toggling of the incremental compile checkbox.'''
+        status = "enabled" if checked else "disabled"
+        self._log_message(f"[INFO] Incremental compile has been {status}.")
     def _is_network_available(self):
         """
     Checks for a live internet connection by attempting to connect to a reliable
@@ -3992,6 +7253,7 @@ Processes the entire log buffer in a single, efficient operation to prevent UI f
             if not self.search_results:
                 self._log_message("[WARN] No active search filter to export.")
                 return
+            self._load_more_search_results(all_rows=True)
             data_to_export = [self.preview_images[i] for i in self.search_results]
             export_description = f"{len(data_to_export)} filtered images"
         elif export_type == "SELECTED":
@@ -4026,7 +7288,7 @@ Processes the entire log buffer in a single, efficient operation to prevent UI f
         self._set_ui_task_active(True)
 
         self.pdf_export_thread = QThread(self)
-        self.pdf_export_worker = self.PdfExportWorker(image_data, save_path)
+        self.pdf_export_worker = self.PdfExportWorker(image_data, save_path, self.xbt_reader)
         self.pdf_export_worker.moveToThread(self.pdf_export_thread)
 
         self.pdf_export_worker.progress.connect(self._on_pdf_export_progress)
@@ -4051,18 +7313,35 @@ Processes the entire log buffer in a single, efficient operation to prevent UI f
         copy_image_action = menu.addAction(qta.icon('fa5s.copy'), "Copy Image to Clipboard")
         copy_filename_action = menu.addAction(qta.icon('fa5s.quote-left'), "Copy Filename")
         open_location_action = menu.addAction(qta.icon('fa5s.folder-open'), "Open File Location")
+        menu.addSeparator()
+        extract_current_action = menu.addAction(qta.icon('fa5s.file-export'), "Extract This Texture...")
+        extract_results_action = menu.addAction(qta.icon('fa5s.filter'), f"Extract Search Results ({self._search_results_count_text()})...")
+        extract_results_action.setEnabled(bool(self.search_results))
+        extract_pattern_action = menu.addAction(qta.icon('fa5s.asterisk'), "Extract Matching Pattern...")
 
         copy_image_action.triggered.connect(self._copy_preview_image_to_clipboard)
         copy_filename_action.triggered.connect(self._copy_preview_filename_to_clipboard)
         open_location_action.triggered.connect(self._open_preview_image_location)
+        extract_current_action.triggered.connect(self._extract_current_texture)
+        extract_results_action.triggered.connect(self._extract_search_results)
+        extract_pattern_action.triggered.connect(self._extract_by_pattern)
 
         menu.exec(self.image_display_label.mapToGlobal(position))
     
     def _copy_preview_image_to_clipboard(self):
         """Copies the currently displayed preview image to the system clipboard."""
         if self.preview_images and self.current_preview_index != -1:
-            image_path = self.preview_images[self.current_preview_index]['path']
-            if os.path.exists(image_path):
+            image_data = self.preview_images[self.current_preview_index]
+            image_path = image_data['path']
+            if self._is_native_record(image_data):
+                # Decoded straight from the mapped .xbt; the clipboard keeps its own copy of the pixels.
+                try:
+                    decoded = next(iter_xbt_frames(self.xbt_reader, [image_data['texture_index']]))
+                    QApplication.clipboard().setImage(decoded.image().copy())
+                    self._log_message(f"[INFO] Copied image '{os.path.basename(image_path)}' to clipboard.")
+                except Exception as e:
+                    self._log_message(f"[ERROR] Failed to decode image for clipboard: {e}")
+            elif self._ensure_preview_file(image_data):
                 image = QImage(image_path)
                 if not image.isNull():
                     QApplication.clipboard().setImage(image)
@@ -4083,7 +7362,7 @@ Processes the entire log buffer in a single, efficient operation to prevent UI f
         """Opens the temporary cache folder and highlights the current image."""
         if self.preview_images and self.current_preview_index != -1:
             image_path = os.path.normpath(self.preview_images[self.current_preview_index]['path'])
-            if os.path.exists(image_path):
+            if self._ensure_preview_file(self.preview_images[self.current_preview_index]):
                 self._log_message(f"[INFO] Opening file location for: {os.path.basename(image_path)}")
                 if sys.platform == "win32":
                     subprocess.run(['explorer', '/select,', image_path])
@@ -4105,7 +7384,7 @@ Processes the entire log buffer in a single, efficient operation to prevent UI f
         s = round(size_bytes / p, 2)
         return f"{s} {size_name[i]}"
     def _scan_cache_dir_fallback(self):
-        """Scans the info cache directory for images. Safe version: No QImageReader checks in loop."""
+        """Scans the info cache directory for images. Dimensions come from a threaded header-only probe, no image is decoded."""
         if not self.info_cache_dir or not os.path.exists(self.info_cache_dir):
             return
 
@@ -4116,29 +7395,30 @@ Processes the entire log buffer in a single, efficient operation to prevent UI f
 
         found_count = 0
         try:
-            # Just walk and trust extensions for speed and stability.
+            # Walk and trust extensions, then read just the headers of what was found.
+            image_paths = []
             for root, dirs, files in os.walk(self.info_cache_dir):
                 for file in files:
                     if file.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif')):
-                        image_path = os.path.join(root, file)
+                        image_paths.append(os.path.join(root, file))
+
+            for image_path, (width, height, _) in zip(image_paths, probe_image_headers(image_paths)):
+                file = os.path.basename(image_path)
+                new_record = {
+                    'path': image_path, 
+                    'filename': file, 
+                    'dimensions': "{}x{}".format(width, height) if width and height else 'N/A', 
+                    'format': os.path.splitext(file)[1][1:].upper(), 
+                    'size': 0
+                }
 
-                        # Create record with placeholders. Real data loaded when viewed.
-                        new_record = {
-                            'path': image_path, 
-                            'filename': file, 
-                            'dimensions': 'N/A', 
-                            'format': os.path.splitext(file)[1][1:].upper(), 
-                            'size': 0
-                        }
-
-                        try:
-                            if os.path.exists(image_path):
-                                new_record['size'] = os.path.getsize(image_path)
-                        except Exception:
-                            pass
+                try:
+                    new_record['size'] = os.path.getsize(image_path)
+                except Exception:
+                    pass
 
-                        self.preview_images.append(new_record)
-                        found_count += 1
+                self.preview_images.append(new_record)
+                found_count += 1
 
             if found_count > 0:
                 self._log_message("[INFO] Fallback scan found {} images.".format(found_count))
@@ -4396,6 +7676,8 @@ class HelpDialog(QDialog):
 
 
 if __name__ == "__main__":
+    # Required for the decompile process pool in the frozen (PyInstaller) build; a no-op otherwise.
+    multiprocessing.freeze_support()
     # Set application name and organization name
     app = QApplication(sys.argv)
     # Removes the default limit (128MB/256MB) on image loading to allow large filmstrips